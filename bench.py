@@ -0,0 +1,274 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+# The rendering benchmark draws into an off-screen window; must be set before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from src.logic.derive import PuzzleDeriver
+from src.logic.difficulty import generate_graded_sudoku
+from src.logic.sudoku_generator import SudokuGenerator, generate_sudoku
+from src.logic.sudoku_solver import solve
+from src.logic.ValidSudoku import is_valid_sudoku, are_valid_sudokus
+
+# (size, cells removed, unique) cases for the generation benchmark
+GENERATE_CASES = [(4, 8, False), (9, 30, False), (9, 50, False), (9, 50, True),
+                  (16, 128, False), (16, 100, True), (25, 312, False)]
+# Modules whose import time is measured, and whether they must stay free of pygame
+STARTUP_MODULES = [("src.logic", True), ("src.logic.sudoku_generator", True), ("src.logic.difficulty", True),
+                   ("generate", True), ("src.graphics.start.StartMenu", False)]
+FORMAT_VERSION = 1
+# Shortest duration of one timing sample, in seconds
+MIN_SAMPLE_TIME = 0.05
+
+
+def time_per_call(function, repeat):
+    """
+    Times `function` over `repeat` samples. An untimed warm-up call fills caches (e.g. the solver's
+    exact cover matrix) and sets how many calls each sample makes, so no sample is shorter than
+    MIN_SAMPLE_TIME and timer resolution does not matter.
+
+    Returns: Fastest sample in seconds per call; slower samples only add scheduler and cache noise
+    """
+    start = time.perf_counter()
+    function()
+    number = max(1, math.ceil(MIN_SAMPLE_TIME / max(time.perf_counter() - start, 1e-9)))
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return min(samples)
+
+
+def bench_generate(results, args):
+    for size, removed, unique in GENERATE_CASES:
+        if args.quick and size >= 16 and unique:
+            continue
+        # The same seeds in every sample and every run, so all of them time the same boards
+        seeds = [f"{args.seed}:generate:{size}:{index}" for index in range(max(2, args.scale * 20 // size))]
+        name = f"generate.{size}x{size}.removed{removed}" + (".unique" if unique else "")
+        seconds = time_per_call(lambda: [generate_sudoku(size, removed, unique, seed) for seed in seeds],
+                                args.repeat)
+        record(results, name, seconds / len(seeds), "s/board")
+
+    # Derived puzzles once the seeds exist, against searching for every graded puzzle
+    deriver = PuzzleDeriver(seeds=2, seed=f"{args.seed}:derive")
+    for difficulty in ("Easy", "Hard"):
+        # The seed searches happen here, so the warm-up and the samples only time derivations
+        for _ in range(deriver.seeds):
+            deriver(9, difficulty, with_solution=True)
+        record(results, f"derive.9x9.{difficulty}",
+               time_per_call(lambda: deriver(9, difficulty, with_solution=True), args.repeat), "s/board")
+
+
+def bench_fill(results, args):
+    # Search effort of fill_remaining in the same restart loop fill_values uses
+    for size in (9, 16):
+        boards = args.scale * 10
+        nodes = backtracks = attempts = 0
+        for index in range(boards):
+            sudoku = SudokuGenerator(size, 0, f"{args.seed}:fill:{size}:{index}")
+            budget = SudokuGenerator.FILL_NODES_PER_CELL * size * size
+            while True:
+                sudoku.fill_diagonal()
+                attempts += 1
+                filled = sudoku.fill_remaining(budget)
+                nodes += sudoku.nodes
+                backtracks += sudoku.backtracks
+                if filled:
+                    break
+                sudoku.clear()
+        record(results, f"fill_remaining.{size}x{size}.nodes", nodes / boards, "nodes/board")
+        record(results, f"fill_remaining.{size}x{size}.backtracks", backtracks / boards, "backtracks/board")
+        record(results, f"fill_remaining.{size}x{size}.attempts", attempts / boards, "attempts/board")
+
+
+def bench_solve(results, args):
+    rng = random.Random(f"{args.seed}:solve")
+    for difficulty in ("Easy", "Hard"):
+        puzzles = [generate_graded_sudoku(9, difficulty, rng) for _ in range(max(2, args.scale))]
+        seconds = time_per_call(lambda: [solve(puzzle) for puzzle in puzzles], args.repeat) / len(puzzles)
+        record(results, f"solve.9x9.{difficulty}", seconds, "s/board")
+
+
+def bench_validate(results, args):
+    for size in (9, 16):
+        board = generate_sudoku(size, 0, seed=f"{args.seed}:validate:{size}")
+        seconds = time_per_call(lambda: is_valid_sudoku(board), args.repeat)
+        record(results, f"is_valid_sudoku.{size}x{size}", seconds, "s/board")
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return
+    batch = [generate_sudoku(9, 0, seed=f"{args.seed}:batch:{index}") for index in range(args.scale * 100)]
+    seconds = time_per_call(lambda: are_valid_sudokus(batch), args.repeat) / len(batch)
+    record(results, "are_valid_sudokus.9x9", seconds, "s/board")
+
+
+def bench_render(results, args):
+    try:
+        import pygame
+    except ImportError:
+        return
+    from src.graphics.SceneManager import scene_manager
+    from src.graphics.board.GameBoard import GameBoard
+
+    puzzle, solution = generate_sudoku(9, 45, seed=f"{args.seed}:render", with_solution=True)
+    board = GameBoard(500, 500, puzzle, solution=solution, save_path=os.devnull)
+    scene_manager.switch(board)
+    blanks = [index for index in range(81) if not board.is_given(index)]
+
+    def full_frame():
+        board.full_redraw = True
+        pygame.display.update(board.draw())
+
+    def edit_frame():
+        # One keystroke's worth of work: a pencil mark changes, then only that cell is redrawn
+        cell = board.cells[blanks[0]]
+        cell.set_value("" if cell.text else "5", False)
+        pygame.display.update(board.draw())
+
+    record(results, "render.full_frame", time_per_call(full_frame, args.repeat), "s/frame")
+    record(results, "render.edit_frame", time_per_call(edit_frame, args.repeat), "s/frame")
+    pygame.quit()
+
+
+def bench_startup(results, args):
+    # Every sample imports the module in a fresh interpreter, as a worker process or a CLI run
+    # would; -X importtime reports the time spent on it and on its parent packages
+    for module, headless in STARTUP_MODULES:
+        samples = []
+        pygame_loaded = False
+        for _ in range(args.repeat):
+            process = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import sys, {module}; print('pygame' in sys.modules)"],
+                capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+            samples.append(import_time(process.stderr, module))
+            pygame_loaded = process.stdout.strip() == "True"
+        record(results, f"import.{module}", min(samples), "s/import")
+        if headless:
+            record(results, f"import.{module}.pygame_loaded", float(pygame_loaded), "flag")
+
+
+# Total cumulative time of the module and its parent packages in `python -X importtime` output
+def import_time(report, module):
+    total = 0
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("  "):
+            continue  # imported from inside another module, already counted in its cumulative time
+        name = name.strip()
+        if module == name or module.startswith(name + "."):
+            total += int(cumulative)
+    return total / 1e6
+
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "generate": bench_generate,
+    "fill": bench_fill,
+    "solve": bench_solve,
+    "validate": bench_validate,
+    "render": bench_render,
+}
+
+
+# Every result is lower-is-better, so one comparison rule covers all of them
+def record(results, name, value, unit):
+    results[name] = {"value": value, "unit": unit}
+    print(f"{name:45} {format_value(value, unit)}", file=sys.stderr)
+
+
+def format_value(value, unit):
+    if unit.startswith("s/"):
+        return f"{value * 1e6:12.1f} us/{unit[2:]}"
+    return f"{value:12.1f} {unit}"
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints each result against the baseline run
+
+    Returns: Names of the results more than `threshold` (a fraction) worse than the baseline
+    """
+    regressions = []
+    print(f"{'benchmark':45} {'baseline':>12} {'current':>12} {'change':>8}", file=sys.stderr)
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None or old["unit"] != result["unit"]:
+            print(f"{name:45} {'(new)':>12}", file=sys.stderr)
+            continue
+        if old["value"]:
+            change = result["value"] / old["value"] - 1
+        else:
+            change = math.inf if result["value"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:45} {old['value']:12.6g} {result['value']:12.6g} {change:+8.1%}{flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark startup, generation, solving, validation and rendering")
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads, for a fast sanity check")
+    parser.add_argument("--repeat", type=int, default=5, help="timing samples per benchmark; the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated workloads (default: 0)")
+    parser.add_argument("--output", "-o", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="slowdown counted as a regression, as a fraction (default: 0.20)")
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+    args.scale = 1 if args.quick else 5
+    if args.quick:
+        args.repeat = min(args.repeat, 3)
+
+    results = {}
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](results, args)
+
+    report = {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "quick": args.quick,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get("quick") != args.quick:
+            print("Warning: the baseline was run with a different --quick setting", file=sys.stderr)
+        if compare(results, baseline["results"], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+import math
+import os
+import random
+import sys
+import time
+from functools import partial
+
+from src.logic.difficulty import DIFFICULTIES, GRADED_SIZES, generate_graded_sudoku
+from src.logic.dedup_index import DedupIndex, puzzle_digest
+from src.logic.derive import PuzzleDeriver
+from src.logic.puzzle_format import SYMBOLS, board_to_line
+from src.logic.puzzle_library import pack_record, write_library
+from src.logic.sudoku_generator import generate_sudoku
+
+# Share of the board removed when neither --removed nor a difficulty is given (40 cells at 9x9)
+DEFAULT_REMOVED_RATIO = 40 / 81
+
+
+def generate_chunk(task):
+    """
+    Worker: generates one chunk of puzzles with its own seed
+
+    Parameters:
+        task (tuple): (seed, count, size, difficulty, removed, unique, library, dedup, derive), where
+            derive is the number of seed puzzles the chunk derives the rest from, or 0 for none
+
+    Returns: List of puzzle lines, or of puzzle library records when library is set. With dedup,
+        each one is paired with its puzzle_digest, so the parent only does set lookups
+    """
+    seed, count, size, difficulty, removed, unique, library, dedup, derive = task
+    rng = random.Random(seed)
+    if derive:
+        graded = PuzzleDeriver(derive, generate_graded_sudoku, rng)
+        carved = PuzzleDeriver(derive, generate_sudoku, rng)
+    else:
+        graded = partial(generate_graded_sudoku, seed=rng)
+        carved = partial(generate_sudoku, seed=rng)
+
+    results = []
+    for _ in range(count):
+        if library:
+            puzzle, solution = graded(size, difficulty, with_solution=True)
+            result = pack_record(puzzle, solution)
+        elif difficulty:
+            puzzle = graded(size, difficulty)
+            result = board_to_line(puzzle)
+        else:
+            puzzle = carved(size, removed, unique)
+            result = board_to_line(puzzle)
+        results.append((puzzle_digest(puzzle), result) if dedup else result)
+    return results
+
+
+def chunk_tasks(args, base_seed, difficulty):
+    # Each chunk gets a distinct string seed, so chunks are independent but the run is repeatable
+    for index, start in enumerate(range(0, args.count, args.chunk_size)):
+        count = min(args.chunk_size, args.count - start)
+        seed = f"{base_seed}:{difficulty}:{index}" if args.library else f"{base_seed}:{index}"
+        yield (seed, count, args.size, difficulty, args.removed, args.unique, bool(args.library), bool(args.dedup),
+               args.derive)
+
+
+def generated_chunks(pool, args, base_seed, difficulty, index):
+    # Chunks as workers finish them; with a dedup index, puzzles isomorphic to one already
+    # indexed (by this run or an earlier one) are dropped
+    for results in pool.imap_unordered(generate_chunk, chunk_tasks(args, base_seed, difficulty)):
+        if index is None:
+            yield results
+        else:
+            yield [result for digest, result in results if index.add_digest(digest)]
+
+
+def library_records(pool, args, base_seed, difficulty, index):
+    # Streams one difficulty's records to write_library as chunks finish
+    for records in generated_chunks(pool, args, base_seed, difficulty, index):
+        yield from records
+
+
+def dedup_report(index):
+    return f", {index.duplicates} isomorphic duplicates dropped" if index is not None else ""
+
+
+def main(argv=None):
+    # argparse and multiprocessing are only needed by the parent; worker processes started with
+    # the spawn method re-import this module and should only pay for what generate_chunk uses
+    import argparse
+    from multiprocessing import Pool
+
+    parser = argparse.ArgumentParser(description="Generate sudoku puzzles in bulk, one puzzle per line")
+    parser.add_argument("count", type=int, help="number of puzzles to generate (per difficulty with --library)")
+    parser.add_argument("--size", type=int, default=9, help="row length of the board (default: 9)")
+    parser.add_argument("--difficulty", choices=DIFFICULTIES,
+                        help="generate graded puzzles of this band instead of a fixed removed count")
+    parser.add_argument("--removed", type=int,
+                        help="cells to remove when no difficulty is given (default: about half the board, "
+                             "40 at 9x9)")
+    parser.add_argument("--unique", action="store_true", help="only keep removals that leave a unique solution")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=100, help="puzzles per worker task")
+    parser.add_argument("--seed", type=int, help="base seed for a repeatable run")
+    parser.add_argument("--output", "-o", help="file to write to (default: stdout)")
+    parser.add_argument("--dedup", metavar="PATH",
+                        help="drop puzzles that are the same as an earlier one up to symmetry (relabeling, row, "
+                             "column, band and stack swaps, transposition), remembering every puzzle kept in "
+                             "this index file across runs; fewer than count puzzles may be written")
+    parser.add_argument("--derive", type=int, default=0, metavar="SEEDS",
+                        help="generate only SEEDS puzzles per chunk and derive the rest from them by random "
+                             "relabeling, row, column, band and stack swaps and transposition, which keeps "
+                             "difficulty and uniqueness and is orders of magnitude faster")
+    parser.add_argument("--library", metavar="PATH",
+                        help="write a memory-mapped puzzle library with solutions instead of text, with count "
+                             "graded puzzles of --difficulty, or of every difficulty if none is given")
+    args = parser.parse_args(argv)
+    if not 1 <= args.size <= len(SYMBOLS) or math.isqrt(args.size) ** 2 != args.size:
+        parser.error(f"--size must be a perfect square up to {len(SYMBOLS)} (4, 9, 16, 25)")
+    if args.count < 1:
+        parser.error("count must be at least 1")
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be at least 1")
+    if args.derive < 0:
+        parser.error("--derive cannot be negative")
+    if args.derive and args.dedup:
+        parser.error("derived puzzles are isomorphic to their seeds, so --dedup would drop them")
+    if (args.difficulty or args.library) and args.size not in GRADED_SIZES:
+        parser.error(f"--difficulty and --library need a graded size: {', '.join(map(str, GRADED_SIZES))}")
+    # --removed is only used when puzzles are not graded
+    if not (args.difficulty or args.library):
+        if args.removed is None:
+            args.removed = round(DEFAULT_REMOVED_RATIO * args.size * args.size)
+        elif not 0 <= args.removed <= args.size * args.size:
+            parser.error(f"--removed must be between 0 and {args.size * args.size} "
+                         f"for a {args.size}x{args.size} board")
+
+    base_seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(64)
+    if args.library:
+        write_library_file(args, base_seed)
+        return
+    output = open(args.output, "w") if args.output else sys.stdout
+    index = DedupIndex(args.dedup) if args.dedup else None
+
+    start = time.perf_counter()
+    written = 0
+    try:
+        with Pool(args.workers) as pool:
+            # Chunks are written as soon as any worker finishes one, so memory stays flat
+            for lines in generated_chunks(pool, args, base_seed, args.difficulty, index):
+                if lines:
+                    output.write("\n".join(lines) + "\n")
+                written += len(lines)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if index is not None:
+            index.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Generated {written} puzzles in {elapsed:.2f}s ({written / elapsed:.1f} puzzles/s, "
+          f"seed {base_seed}{dedup_report(index)})", file=sys.stderr)
+
+
+def write_library_file(args, base_seed):
+    from multiprocessing import Pool
+
+    difficulties = [args.difficulty] if args.difficulty else list(DIFFICULTIES)
+    index = DedupIndex(args.dedup) if args.dedup else None
+
+    start = time.perf_counter()
+    try:
+        with Pool(args.workers) as pool:
+            sections = [(difficulty, library_records(pool, args, base_seed, difficulty, index))
+                        for difficulty in difficulties]
+            counts = write_library(args.library, args.size, sections)
+    finally:
+        if index is not None:
+            index.close()
+
+    elapsed = time.perf_counter() - start
+    written = sum(counts.values())
+    print(f"Wrote {written} puzzles to {args.library} in {elapsed:.2f}s ({written / elapsed:.1f} puzzles/s, "
+          f"seed {base_seed}{dedup_report(index)})", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
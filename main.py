@@ -1,5 +1,10 @@
-from src.graphics.start.StartMenu import StartMenu
+def main():
+    # pygame and the screens are only imported once a window is actually opened
+    from src.graphics.start.StartMenu import StartMenu
 
-if __name__ == '__main__':
     menu = StartMenu(500, 500)
     menu.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+from src.logic.board import Board
+from src.logic.sudoku_solver import DancingLinks
+from src.logic.ValidSudoku import is_valid_sudoku
+
+HEADER = "line\tstatus\tsolution\tseconds\tnodes\tunique"
+
+
+def solve_chunk(chunk):
+    """
+    Worker: solves and verifies one chunk of puzzle lines
+
+    Each puzzle is searched for up to two solutions, which is what telling a unique puzzle apart
+    costs. The first solution must pass is_valid_sudoku and keep every given, or the puzzle is
+    reported as failed.
+
+    Parameters:
+        chunk (list): (line number, puzzle line) pairs
+
+    Returns: List of (line number, status, solution line, seconds, nodes, unique) tuples, where
+        status is solved, unsolvable, invalid (the line is not a puzzle) or failed (verification)
+    """
+    results = []
+    for line_number, line in chunk:
+        start = time.perf_counter()
+        try:
+            puzzle = Board.from_line(line)
+        except ValueError:
+            results.append((line_number, "invalid", "", 0.0, 0, False))
+            continue
+
+        links = DancingLinks(puzzle)
+        found = links.search(2)
+        seconds = time.perf_counter() - start
+        if not found:
+            results.append((line_number, "unsolvable", "", seconds, links.nodes, False))
+            continue
+
+        solution = Board.from_rows(links.solutions[0])
+        keeps_givens = all(given in (0, num) for given, num in zip(puzzle.cells, solution.cells))
+        status = "solved" if keeps_givens and is_valid_sudoku(solution) else "failed"
+        results.append((line_number, status, solution.to_line(), seconds, links.nodes, found == 1))
+    return results
+
+
+def read_chunks(file, chunk_size):
+    # Puzzle lines in chunks, read lazily; only the first field counts, so trailing comments,
+    # ratings or names in the collection are ignored, as are blank and '#' lines
+    puzzles = ((number, line.split()[0]) for number, line in enumerate(file, 1)
+               if line.strip() and not line.startswith("#"))
+    while True:
+        chunk = list(islice(puzzles, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Summary:
+    """
+    Running totals over the solved puzzles, printed at the end of a run
+
+    Attributes:
+        statuses (dict): Number of puzzles per status
+        unique (int): Puzzles with exactly one solution
+        total_seconds, max_seconds (float): Solve time over all puzzles / of the slowest one
+        total_nodes, max_nodes (int): Search nodes over all puzzles / of the hardest one
+        hardest_line (int): Line number of the puzzle with the most nodes
+
+    Methods:
+        add(result): Adds one result tuple from solve_chunk
+        report(elapsed): Returns the summary as text
+    """
+
+    def __init__(self):
+        self.statuses = {"solved": 0, "unsolvable": 0, "invalid": 0, "failed": 0}
+        self.unique = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_nodes = 0
+        self.max_nodes = 0
+        self.hardest_line = None
+
+    def add(self, result):
+        line_number, status, _, seconds, nodes, unique = result
+        self.statuses[status] += 1
+        self.unique += unique
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.total_nodes += nodes
+        if nodes > self.max_nodes:
+            self.max_nodes, self.hardest_line = nodes, line_number
+
+    def report(self, elapsed):
+        count = sum(self.statuses.values())
+        per_puzzle = max(count, 1)
+        lines = [
+            f"Processed {count} puzzles in {elapsed:.2f}s ({count / elapsed:.1f} puzzles/s)",
+            "  " + ", ".join(f"{status}: {number}" for status, number in self.statuses.items()) +
+            f", unique: {self.unique}",
+            f"  solve time: mean {self.total_seconds / per_puzzle * 1e3:.3f} ms, max {self.max_seconds * 1e3:.3f} ms",
+            f"  nodes: mean {self.total_nodes / per_puzzle:.1f}, max {self.max_nodes}"
+            + (f" (line {self.hardest_line})" if self.hardest_line is not None else ""),
+        ]
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    # argparse and multiprocessing are only needed by the parent, not by spawned workers
+    import argparse
+    from multiprocessing import Pool
+
+    parser = argparse.ArgumentParser(
+        description="Solve and verify a file of puzzles (one per line, '.' or '0' for blanks) across a "
+                    "process pool. Writes one tab-separated result per puzzle, in input order.")
+    parser.add_argument("input", help="puzzle file, or - for stdin")
+    parser.add_argument("--output", "-o", help="file to write results to (default: stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="puzzles per worker task")
+    parser.add_argument("--max-in-flight", type=int,
+                        help="chunks submitted but not yet written (default: 2 per worker); bounds memory "
+                             "however large the input is")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be at least 1")
+    if args.max_in_flight is not None and args.max_in_flight < 1:
+        parser.error("--max-in-flight must be at least 1")
+    max_in_flight = args.max_in_flight if args.max_in_flight is not None else 2 * args.workers
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    output = open(args.output, "w") if args.output else sys.stdout
+    summary = Summary()
+
+    def write(results):
+        for result in results:
+            summary.add(result)
+            line_number, status, solution, seconds, nodes, unique = result
+            output.write(f"{line_number}\t{status}\t{solution}\t{seconds:.6f}\t{nodes}\t"
+                         f"{'yes' if unique else 'no'}\n")
+
+    start = time.perf_counter()
+    try:
+        output.write(HEADER + "\n")
+        with Pool(args.workers) as pool:
+            # A chunk is only read once an earlier one has been written, so at most
+            # max_in_flight chunks of input and results are held at any time
+            pending = deque()
+            for chunk in read_chunks(source, args.chunk_size):
+                if len(pending) >= max_in_flight:
+                    write(pending.popleft().get())
+                pending.append(pool.apply_async(solve_chunk, (chunk,)))
+            while pending:
+                write(pending.popleft().get())
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(summary.report(time.perf_counter() - start), file=sys.stderr)
+    if summary.statuses["failed"]:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import time
+import pygame
+
+
+class FrameLoop:
+    """
+    Shared main loop for the game's screens
+
+    Repaints only when something may have changed and sleeps in pygame.event.wait() otherwise,
+    so an idle screen uses next to no CPU. Repaints are capped at max_fps.
+
+    Attributes:
+        handle_event (function): Called with every event; may return True to request a repaint
+        draw (function): Draws the screen. If it returns a list of rects, only those are pushed to the
+            display with display.update(); otherwise the loop calls display.flip()
+        max_fps (int): Upper bound on repaints per second
+        clock (pygame.time.Clock): Clock used for the cap
+        running (bool): The loop exits after the current iteration once this is False
+        dirty (bool): A repaint is pending
+        frames (int): Number of repaints so far
+        last_frame_time, max_frame_time, total_frame_time (float): Repaint durations in seconds
+
+    Methods:
+        run(): Runs until stop() is called
+        stop(): Ends the loop
+        request_redraw(): Schedules a repaint without an event
+        average_frame_time(): Mean repaint duration in seconds
+    """
+
+    # Events after which the window contents must be repainted in full
+    EXPOSE_EVENTS = {
+        pygame.VIDEOEXPOSE,
+        pygame.VIDEORESIZE,
+        pygame.WINDOWEXPOSED,
+        pygame.WINDOWSHOWN,
+        pygame.WINDOWRESTORED,
+    }
+    # Events that can change what is on screen even if handle_event does not say so
+    REDRAW_EVENTS = EXPOSE_EVENTS | {
+        pygame.MOUSEBUTTONDOWN,
+        pygame.MOUSEBUTTONUP,
+        pygame.KEYDOWN,
+    }
+
+    def __init__(self, handle_event, draw, max_fps=60):
+        self.handle_event = handle_event
+        self.draw = draw
+        self.max_fps = max_fps
+        self.clock = pygame.time.Clock()
+        self.running = False
+        self.dirty = True
+
+        self.frames = 0
+        self.last_frame_time = 0.0
+        self.max_frame_time = 0.0
+        self.total_frame_time = 0.0
+
+    def run(self):
+        self.running = True
+        self.dirty = True
+        while self.running:
+            if self.dirty:
+                events = pygame.event.get()
+            else:
+                # Nothing to repaint: block until the next event arrives
+                events = [pygame.event.wait()] + pygame.event.get()
+
+            for event in events:
+                if self.handle_event(event) or event.type in self.REDRAW_EVENTS:
+                    self.dirty = True
+                if not self.running:
+                    return
+
+            if self.dirty:
+                start = time.perf_counter()
+                dirty_rects = self.draw()
+                if dirty_rects is None:
+                    pygame.display.flip()
+                elif dirty_rects:
+                    pygame.display.update(dirty_rects)
+                self.record_frame(time.perf_counter() - start)
+                self.dirty = False
+
+            self.clock.tick(self.max_fps)
+
+    def stop(self):
+        self.running = False
+
+    def request_redraw(self):
+        self.dirty = True
+
+    def record_frame(self, frame_time):
+        self.frames += 1
+        self.last_frame_time = frame_time
+        self.max_frame_time = max(self.max_frame_time, frame_time)
+        self.total_frame_time += frame_time
+
+    def average_frame_time(self):
+        return self.total_frame_time / self.frames if self.frames else 0.0
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+import pygame
+
+
+class ResourceCache:
+    """
+    Fonts and rendered text surfaces shared by every screen
+
+    Fonts are loaded once per (face, size, bold) and text is rendered once per (font, text, color),
+    so rebuilding a screen or changing the resolution back and forth only costs blits. Both caches
+    drop their least recently used entries: fonts past max_fonts, surfaces once their pixel data
+    exceeds max_bytes.
+
+    Attributes:
+        max_fonts (int): Number of fonts kept loaded
+        max_bytes (int): Memory budget for rendered surfaces
+        fonts (OrderedDict): Loaded fonts by (face, size, bold), least recently used first
+        surfaces (OrderedDict): Rendered surfaces by (font, text, color, antialias), least recently used first
+        surface_bytes (int): Pixel memory currently held by surfaces
+        font_hits, font_misses, surface_hits, surface_misses, evictions (int): Usage counters
+
+    Methods:
+        font(size, face, bold): Returns the font, loading it on first use
+        text(font, text, color, antialias): Returns the rendered surface, rendering it on first use
+        stats(): The counters and current usage as a dict
+        clear(): Drops every font and surface, e.g. once pygame is shut down
+    """
+
+    def __init__(self, max_fonts=32, max_bytes=8 * 1024 * 1024):
+        self.max_fonts = max_fonts
+        self.max_bytes = max_bytes
+        self.fonts = OrderedDict()
+        self.surfaces = OrderedDict()
+        self.surface_bytes = 0
+
+        self.font_hits = 0
+        self.font_misses = 0
+        self.surface_hits = 0
+        self.surface_misses = 0
+        self.evictions = 0
+
+    def font(self, size, face=None, bold=False):
+        key = (face, size, bold)
+        font = self.fonts.get(key)
+        if font is not None:
+            self.font_hits += 1
+            self.fonts.move_to_end(key)
+            return font
+
+        self.font_misses += 1
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.Font(face, size)
+        font.set_bold(bold)
+        self.fonts[key] = font
+        if len(self.fonts) > self.max_fonts:
+            self.fonts.popitem(last=False)
+            self.evictions += 1
+        return font
+
+    def text(self, font, text, color, antialias=True):
+        key = (font, text, tuple(pygame.Color(color)), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surface_hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.surface_misses += 1
+        surface = font.render(text, antialias, key[2])
+        self.surfaces[key] = surface
+        self.surface_bytes += surface_size(surface)
+        # Always keep the surface just rendered, even if it alone is over budget
+        while self.surface_bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.surface_bytes -= surface_size(evicted)
+            self.evictions += 1
+        return surface
+
+    def stats(self):
+        return {
+            "fonts": len(self.fonts),
+            "surfaces": len(self.surfaces),
+            "surface_bytes": self.surface_bytes,
+            "font_hits": self.font_hits,
+            "font_misses": self.font_misses,
+            "surface_hits": self.surface_hits,
+            "surface_misses": self.surface_misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self.fonts.clear()
+        self.surfaces.clear()
+        self.surface_bytes = 0
+
+
+# Bytes of pixel data held by a surface
+def surface_size(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+# Cache shared by all screens
+resources = ResourceCache()
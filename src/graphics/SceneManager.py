@@ -0,0 +1,105 @@
+import pygame
+from .FrameLoop import FrameLoop
+from .ResourceCache import resources
+
+
+class SceneManager:
+    """
+    Owns the one pygame display and the main loop, and switches between screens (scenes)
+
+    A scene is any object with handle_event(event) and draw(). Switching only swaps the object on
+    top of the stack, so pygame is never re-initialized, the window is reused, the call stack does
+    not grow with each transition, and replaced scenes can be garbage collected.
+
+    Attributes:
+        stack (list): Active scenes; the last one receives events and is drawn
+        loop (FrameLoop): Main loop while run() is active, otherwise None
+
+    Methods:
+        get_screen(width, height): Returns the display surface, resizing the window only if needed
+        current(): The scene on top of the stack, or None
+        push(scene) / pop(): Opens a scene over the current one / returns to the one below
+        switch(scene): Replaces the current scene
+        run(scene): Shows a scene, starting the main loop unless it is already running
+        quit(): Ends the main loop and shuts pygame down
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.loop = None
+
+    def get_screen(self, width, height):
+        if not pygame.get_init():
+            pygame.init()
+        screen = pygame.display.get_surface()
+        if screen is None or screen.get_size() != (width, height):
+            screen = pygame.display.set_mode((width, height))
+        return screen
+
+    def current(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene):
+        self.stack.append(scene)
+        self.scene_changed()
+
+    def pop(self):
+        self.stack.pop()
+        if not self.stack:
+            self.quit()
+            return
+        self.scene_changed()
+
+    def switch(self, scene):
+        if self.stack:
+            self.stack[-1] = scene
+        else:
+            self.stack.append(scene)
+        self.scene_changed()
+
+    def run(self, scene=None):
+        if scene is not None:
+            self.switch(scene)
+        if self.loop is not None:
+            # Called from inside a running scene: the switch above is all that is needed
+            return
+
+        self.loop = FrameLoop(self.handle_event, self.draw)
+        try:
+            self.loop.run()
+        finally:
+            self.loop = None
+            self.stack.clear()
+            # Fonts and surfaces do not survive pygame.quit()
+            resources.clear()
+            pygame.quit()
+
+    def quit(self):
+        self.stack.clear()
+        if self.loop is not None:
+            self.loop.stop()
+
+    # The newly shown scene must be painted in full on the next frame
+    def scene_changed(self):
+        scene = self.current()
+        if hasattr(scene, "full_redraw"):
+            scene.full_redraw = True
+        if self.loop is not None:
+            self.loop.request_redraw()
+
+    def handle_event(self, event):
+        scene = self.current()
+        if scene is None:
+            return False
+        redraw = scene.handle_event(event)
+        return redraw or self.current() is not scene
+
+    def draw(self):
+        scene = self.current()
+        if scene is not None:
+            return scene.draw()
+        return None
+
+
+# Manager shared by every screen of the game
+scene_manager = SceneManager()
@@ -1,13 +1,14 @@
 import pygame
-import sys
 from ..start.MenuOption import MenuOption
+from ..SceneManager import scene_manager
 from ..start.StartMenu import StartMenu
 from .GameBoard import GameBoard
 
 
 def generate_bottom_button_group(screen_width, screen_height, section_ratio, font, screen, grid,
                                  button_start_x_pos=0,
-                                 button_spacing=50):
+                                 button_spacing=50,
+                                 board=None):
     """
     Generates UI buttons for sudoku puzzle; returns pygame sprite group
 
@@ -19,6 +20,8 @@ def generate_bottom_button_group(screen_width, screen_height, section_ratio, fon
         grid (list): Sudoku grid layout
         button_start_x_pos (int): Starting x position for first button
         button_spacing (int): Spacing between buttons
+        board (GameBoard): Board the Hint, Check and Solve buttons act on (they are left out without one),
+            and that Exit and Restart save before leaving
 
     Returns:
         pygame.sprite.Group: Group containing button sprites
@@ -30,10 +33,15 @@ def generate_bottom_button_group(screen_width, screen_height, section_ratio, fon
 
     # lamdas used to prevent premature execution of functions
     bottom_menu_options = {
-        "Exit": quit_game,
-        "Restart": lambda width=screen_width, height=screen_height, act=restart: act(width, height),
-        "Reset": lambda width=screen_width, height=screen_height, grid=grid, act=reset: act(width, height, grid)
+        "Exit": board.quit_game if board is not None else quit_game,
+        "Restart": lambda width=screen_width, height=screen_height, board=board, act=restart: act(width, height, board),
+        "Reset": lambda width=screen_width, height=screen_height, grid=grid, board=board, act=reset:
+            act(width, height, grid, board.solution if board is not None else None)
     }
+    if board is not None:
+        bottom_menu_options["Hint"] = board.show_hint
+        bottom_menu_options["Check"] = board.check_entries
+        bottom_menu_options["Solve"] = board.solve_board
 
     button_group = pygame.sprite.Group()
     current_x_pos = button_start_x_pos
@@ -60,17 +68,17 @@ def create_button(text, action, pos_x, pos_y, font, screen, color='black', *para
 
 
 def quit_game():
-    pygame.quit()
-    sys.exit()
+    scene_manager.quit()
 
 
-def restart(screen_width, screen_height):
+def restart(screen_width, screen_height, board=None):
+    # The abandoned game can still be resumed from the menu
+    if board is not None:
+        board.save_game()
     new_menu = StartMenu(screen_width, screen_height)
-    new_menu.run()
+    scene_manager.switch(new_menu)
 
 
-def reset(screen_width, screen_height, grid):
-    pygame.quit()
-
-    new_board = GameBoard(screen_width, screen_height, grid)
-    new_board.run()
+def reset(screen_width, screen_height, grid, solution=None):
+    new_board = GameBoard(screen_width, screen_height, grid, solution=solution)
+    scene_manager.switch(new_board)
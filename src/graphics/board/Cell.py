@@ -1,10 +1,14 @@
 import pygame
+from ..ResourceCache import resources
 
 
-class Cell(pygame.sprite.Sprite):
+class Cell(pygame.sprite.DirtySprite):
     """
     Interactive Sudoku cell sprite for Pygame application
 
+    The image is only re-rendered when the text, text color or background color changes; the
+    sprite is then flagged dirty so a LayeredDirty group blits just this cell.
+
     Attributes:
         font (pygame.font.Font): Font for cell text
         default_background_color, highlight_color, default_text_color, sketched_text_color (tuple): Color configurations
@@ -13,15 +17,24 @@ class Cell(pygame.sprite.Sprite):
         filled_in (bool): Indicates if cell is pre-filled
         text (str): Text content of cell
         active (bool): Active state of cell
+        conflict (bool): True when the cell's number clashes with another in its row, column or box
+        conflict_color (tuple): Background color of a conflicting cell
+        mistake (bool): True when a check found the cell's number differs from the solution
+        mistake_color (tuple): Background color of a cell marked as a mistake
+        on_change (function): Called with the cell whenever its text or filled_in state changes
         image (pygame.Surface): Surface for cell representation
         rect (pygame.Rect): Rectangular area of cell
         outline_color (tuple): Color of cell border
         outline_width (int): Thickness of cell border
+        rendered_state (tuple): (text, text color, background color) the image was last drawn with
 
     Methods:
-        update(): Redraws the cell with updated properties
-        handle_event(event): Handles events like mouse clicks and key presses
+        update(): Redraws the cell if any of its properties changed
+        handle_event(event): Handles key presses while the cell is active
         set_active(boole): Sets the active state of the cell
+        set_conflict(boole): Sets the conflict state of the cell
+        set_mistake(boole): Sets the mistake state of the cell
+        set_value(text, filled_in): Replaces the cell's contents as if the player had typed them
     """
 
     def __init__(self, pos_x, pos_y, filled_in, text, width, height, font, screen,
@@ -30,7 +43,10 @@ class Cell(pygame.sprite.Sprite):
                  outline_width=2,
                  default_background_color='white',
                  default_text_color='black',
-                 sketched_text_color='grey'):
+                 sketched_text_color='grey',
+                 conflict_color=(255, 190, 190),
+                 mistake_color=(255, 215, 120),
+                 on_change=None):
 
         super().__init__()
         self.font = font
@@ -38,11 +54,17 @@ class Cell(pygame.sprite.Sprite):
         self.highlight_color = highlight_color
         self.default_text_color = default_text_color
         self.sketched_text_color = sketched_text_color
-        self.current_color = self.default_text_color
         self.screen = screen
         self.filled_in = filled_in
         self.text = str(text)
         self.active = False
+        self.conflict = False
+        self.conflict_color = conflict_color
+        self.mistake = False
+        self.mistake_color = mistake_color
+        self.current_color = self.background_color()
+        self.on_change = on_change
+        self.rendered_state = None
 
         self.image = pygame.Surface((width, height), pygame.SRCALPHA)
         self.rect = self.image.get_rect(topleft=(pos_x, pos_y))
@@ -50,31 +72,28 @@ class Cell(pygame.sprite.Sprite):
         self.outline_width = outline_width
 
     def update(self, *args, **kwargs):
-        self.image.fill(self.current_color)
-        pygame.draw.rect(self.image, self.outline_color, self.image.get_rect(), self.outline_width)
-
         text_color = self.default_text_color if self.filled_in else self.sketched_text_color
+        state = (self.text, text_color, self.current_color)
+        if state == self.rendered_state:
+            return
+        self.rendered_state = state
 
-        pygame.font.init()
+        self.image.fill(self.current_color)
+        pygame.draw.rect(self.image, self.outline_color, self.image.get_rect(), self.outline_width)
 
-        text_surface = self.font.render(self.text, True, pygame.Color(text_color))
-        text_rect = text_surface.get_rect(center=(self.rect.width / 2, self.rect.height / 2))
-        self.image.blit(text_surface, text_rect)
+        if self.text:
+            text_surface = resources.text(self.font, self.text, text_color)
+            text_rect = text_surface.get_rect(center=(self.rect.width / 2, self.rect.height / 2))
+            self.image.blit(text_surface, text_rect)
 
-        if not self.active:
-            self.current_color = self.default_background_color
+        self.dirty = 1
 
+    # Clicks are hit-tested by InputRouter, which activates the cell; only key presses reach here
     def handle_event(self, event):
-        # Allow highlighting for all cells
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if self.rect.collidepoint(event.pos):
-                self.set_active(True)
-            else:
-                self.set_active(False)
-
         # Allow editing only active if not filled in
         if not self.filled_in and self.active:
             if event.type == pygame.KEYDOWN:
+                previous = (self.text, self.filled_in)
                 if event.key == pygame.K_BACKSPACE:
                     self.text = self.text[:-1]
                 elif event.unicode.isdigit() and 1 <= int(event.unicode) <= 9:
@@ -83,6 +102,37 @@ class Cell(pygame.sprite.Sprite):
                     self.filled_in = True
                     self.set_active(False)
 
+                if (self.text, self.filled_in) != previous:
+                    self.changed()
+
     def set_active(self, boole):
         self.active = boole
-        self.current_color = self.highlight_color if self.active else self.default_background_color
+        self.current_color = self.highlight_color if self.active else self.background_color()
+
+    def set_conflict(self, boole):
+        self.conflict = boole
+        if not self.active:
+            self.current_color = self.background_color()
+
+    def set_mistake(self, boole):
+        self.mistake = boole
+        if not self.active:
+            self.current_color = self.background_color()
+
+    def set_value(self, text, filled_in):
+        if (text, filled_in) != (self.text, self.filled_in):
+            self.text = text
+            self.filled_in = filled_in
+            self.changed()
+
+    # Any edit makes an earlier check outdated
+    def changed(self):
+        if self.mistake:
+            self.set_mistake(False)
+        if self.on_change is not None:
+            self.on_change(self)
+
+    def background_color(self):
+        if self.mistake:
+            return self.mistake_color
+        return self.conflict_color if self.conflict else self.default_background_color
@@ -1,6 +1,7 @@
 import pygame
-import sys
 from ..start.MenuOption import MenuOption
+from ..SceneManager import scene_manager
+from ..ResourceCache import resources
 
 
 class EndGameScreen:
@@ -18,22 +19,23 @@ class EndGameScreen:
         Methods:
             add_menu_option(text, action, pos_x, pos_y): Adds menu options to the screen
             quit_game(): Static method to quit the game
-            run(): Main loop for the end game screen; event handling and display updates
+            run(): Shows this screen through the shared scene manager
+            handle_event(event): Dispatches one event to the menu options
+            draw(): Redraws the screen
         """
 
     def __init__(self, default_screen_width, default_screen_height, won_game):
         self.screen_width = default_screen_width
         self.screen_height = default_screen_height
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = scene_manager.get_screen(self.screen_width, self.screen_height)
 
-        pygame.font.init()
         FONT_SIZE_PROPORTION = 0.1  # % of the average screen dimension
         MIN_FONT_SIZE = 24  # Minimum font size for visibility
 
         average_screen_dimension = (self.screen_width + self.screen_height) // 2
         font_size = max(int(average_screen_dimension * FONT_SIZE_PROPORTION), MIN_FONT_SIZE)
 
-        self.font = pygame.font.Font(None, font_size)
+        self.font = resources.font(font_size)
         self.menu_options = pygame.sprite.Group()
 
         self.message = "Congratulations, You Won!" if won_game else "Game Over, You Lost!"
@@ -50,25 +52,24 @@ class EndGameScreen:
 
     @staticmethod
     def quit_game():
-        pygame.quit()
-        sys.exit()
+        scene_manager.quit()
 
     def run(self):
-        while True:
-            event_list = pygame.event.get()
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                for option in self.menu_options:
-                    option.handle_event(event)
-
-            self.screen.fill((255, 255, 255))
-            message_surf = self.font.render(self.message, True, self.message_color)
-            message_rect = message_surf.get_rect(center=(self.screen_width // 2, self.screen_height // 4))
-            self.screen.blit(message_surf, message_rect)
-
-            self.menu_options.update(event_list)
-            self.menu_options.draw(self.screen)
-            pygame.display.flip()
+        scene_manager.run(self)
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            scene_manager.quit()
+            return
+
+        for option in self.menu_options:
+            option.handle_event(event)
+
+    def draw(self):
+        self.screen.fill((255, 255, 255))
+        message_surf = resources.text(self.font, self.message, self.message_color)
+        message_rect = message_surf.get_rect(center=(self.screen_width // 2, self.screen_height // 4))
+        self.screen.blit(message_surf, message_rect)
+
+        self.menu_options.update()
+        self.menu_options.draw(self.screen)
@@ -1,9 +1,16 @@
 import pygame
-import sys
 import math
+import time
 
 from .Cell import Cell
-from ...logic.ValidSudoku import is_valid_sudoku
+from .InputRouter import InputRouter
+from ..FrameLoop import FrameLoop
+from ..SceneManager import scene_manager
+from ..ResourceCache import resources
+from ...logic.live_board import LiveBoard
+from ...logic.sudoku_solver import solve
+from ...logic.board import Board, board_units
+from ...logic.saved_game import SavedGame, DEFAULT_SAVE_PATH
 from .EndGameScreen import EndGameScreen
 
 
@@ -12,7 +19,8 @@ class GameBoard:
     Sudoku game board in Pygame; handles GUI, game logic, and event loop.
 
     Attributes:
-        initial_game_grid (list): Initial Sudoku puzzle configuration
+        initial_game_grid (list or Board): Initial Sudoku puzzle configuration
+        solution (list or Board): Completed grid for the puzzle; solved once on first use if not supplied
         screen_width, screen_height (int): Pygame window dimensions
         screen (pygame.Surface): Main drawing surface
         background_color (tuple): Game board background color
@@ -22,10 +30,29 @@ class GameBoard:
         cell_number (int): Cells per row/column in Sudoku grid
         SPACE_FOR_BUTTONS_RATIO (float): Screen portion for GUI buttons
         bottom_buttons (pygame.sprite.Group): Sprite group for GUI buttons
-        cell_group (pygame.sprite.Group): Sprite group for Sudoku cells
+        cell_group (pygame.sprite.LayeredDirty): Sprite group for Sudoku cells; only changed cells are blitted
+        full_redraw (bool): The next draw() repaints the whole window instead of the changed cells
+        cells (list): The cells in row-major order
+        input_router (InputRouter): Maps clicks and key presses to the cell they concern
+        live_board (LiveBoard): Entered numbers with O(1) completeness and conflict queries
+        start_time (float): time.monotonic() at which the game would have started if played in one sitting
+        save_path (str): File the game is saved to when the player quits or leaves it
+        solved_by_player (bool): False once Solve, or a Hint for the last cell, completed the board;
+            the board then stays on screen instead of counting as a win
 
     Methods:
-        run(): Main game loop; event handling and GUI updates
+        run(): Shows this board through the shared scene manager
+        handle_event(event): Dispatches one event to the cells and buttons
+        draw(): Redraws what changed; returns the updated screen areas
+        cell_changed(row, col, cell): Updates live_board and conflict highlights after an edit
+        get_solution(): Returns the completed grid
+        show_hint(): Fills the active cell, or the first unsolved one, with its solution value
+        check_entries(): Marks every entry that differs from the solution and unlocks it for correction
+        solve_board(): Fills every cell with its solution value
+        elapsed_time(): Seconds played, including time before the game was resumed
+        restore(saved_game): Puts back the entries and pencil marks of a SavedGame
+        save_game(): Saves the game so it can be resumed
+        quit_game(): Saves the game and quits
         move_highlight(key): Highlight movement between cells
         draw_grid(): Draws Sudoku grid lines, GUI adjusted
     """
@@ -35,16 +62,22 @@ class GameBoard:
                  cell_number=9,
                  cell_boarder_thickness=6,
                  background_color='white',
-                 line_color='black'):
+                 line_color='black',
+                 solution=None,
+                 elapsed=0.0,
+                 save_path=DEFAULT_SAVE_PATH):
 
         self.initial_game_grid = game_grid
+        self.solution = solution
+        self.start_time = time.monotonic() - elapsed
+        self.save_path = save_path
+        self.solved_by_player = True
 
-        # begins pygame and screen
-        pygame.init()
+        # reuses the pygame display, resizing it if needed
         self.screen_width = default_screen_width
         self.screen_height = default_screen_height
+        self.screen = scene_manager.get_screen(self.screen_width, self.screen_height)
         pygame.display.set_caption(caption)
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
 
         # generates GUI
         self.background_color = background_color
@@ -52,7 +85,7 @@ class GameBoard:
         MIN_FONT_SIZE = 1
         average_screen_dimension = (self.screen_width + self.screen_height) // 2
         font_size = max(int(average_screen_dimension * FONT_SIZE_PROPORTION), MIN_FONT_SIZE)
-        self.font = pygame.font.Font(None, font_size)
+        self.font = resources.font(font_size)
         self.line_color = line_color
         self.cell_boarder_thickness = cell_boarder_thickness
         self.cell_number = cell_number
@@ -63,8 +96,8 @@ class GameBoard:
         VERTICAL_RATIO = (self.screen_height - self.screen_height * self.SPACE_FOR_BUTTONS_RATIO) // cell_number
 
         #  makes bottom sprite group and runs the method to generate the area
-        BUTTON_START_POS = default_screen_width // 4
-        BUTTON_SPACING = default_screen_width // 4
+        BUTTON_START_POS = default_screen_width // 12
+        BUTTON_SPACING = default_screen_width // 6
 
         #  Creates the bottom GUI
         from .BottomButtons import generate_bottom_button_group  # Prevents circular import
@@ -75,108 +108,207 @@ class GameBoard:
                                                            self.screen,
                                                            self.initial_game_grid,
                                                            BUTTON_START_POS,
-                                                           BUTTON_SPACING)
+                                                           BUTTON_SPACING,
+                                                           board=self)
 
         # Creates cell grid
         CELL_WIDTH = HORIZONTAL_RATIO
         CELL_HEIGHT = VERTICAL_RATIO
         CELL_PARAMETERS = (CELL_WIDTH, CELL_HEIGHT, self.font, self.screen,)
 
-        self.cell_group = pygame.sprite.Group()
+        self.live_board = LiveBoard(game_grid)
+        self.peers = board_units(cell_number)[3]
+
+        self.cell_group = pygame.sprite.LayeredDirty()
+        self.full_redraw = True
+        self.cells = []
         # Create a cell for each position in the grid
         for y, row in enumerate(game_grid):
             for x, number in enumerate(row):
                 cell_x_pos = x * HORIZONTAL_RATIO
                 cell_y_pos = y * VERTICAL_RATIO
+                on_change = lambda cell, row=y, col=x: self.cell_changed(row, col, cell)
 
                 if number != 0 and number is not None:
                     text = str(number)
-                    cell = Cell(cell_x_pos, cell_y_pos, True, text, *CELL_PARAMETERS)
+                    cell = Cell(cell_x_pos, cell_y_pos, True, text, *CELL_PARAMETERS, on_change=on_change)
 
                 else:
                     text = ''
-                    cell = Cell(cell_x_pos, cell_y_pos, False, text, *CELL_PARAMETERS)
+                    cell = Cell(cell_x_pos, cell_y_pos, False, text, *CELL_PARAMETERS, on_change=on_change)
 
                 self.cell_group.add(cell)
+                self.cells.append(cell)
 
-                #  Used for arrow key activation
-                self.current_row = 0
-                self.current_col = 0
-
-                cells = list(self.cell_group)
-                cells[0].set_active(True)
+        #  Used for arrow key activation
+        self.current_row = 0
+        self.current_col = 0
+        self.input_router = InputRouter(self.cells, cell_number, CELL_WIDTH, CELL_HEIGHT)
+        self.input_router.activate(0)
 
     def run(self):
-        while True:
-            event_list = pygame.event.get()
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                for cell in self.cell_group:
-                    cell.handle_event(event)
-
-                if event.type == pygame.KEYDOWN:
-                    if event.key in [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]:
-                        self.move_highlight(event.key)
-
+        scene_manager.run(self)
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.quit_game()
+            return
+
+        if event.type in FrameLoop.EXPOSE_EVENTS:
+            self.full_redraw = True
+
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.input_router.cell_index_at(event.pos) is not None:
+                index = self.input_router.handle_click(event.pos)
+                self.current_row, self.current_col = divmod(index, self.cell_number)
+            else:
+                # Only clicks outside the grid can reach the buttons; the highlighted cell stays
+                # active so Hint can fill it
                 for button in self.bottom_buttons:
                     button.handle_event(event)
 
-                # Game Over screen
-                every_celled_filled_in = all([cell.filled_in for cell in self.cell_group])
-                if every_celled_filled_in:
-                    game_grid = []
-                    current_row = []
-                    for cell in self.cell_group:
-                        current_row.append(int(cell.text))
+        elif event.type == pygame.KEYDOWN:
+            if event.key in [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]:
+                self.move_highlight(event.key)
+            else:
+                self.input_router.handle_key(event)
 
-                        if len(current_row) == 9:
-                            game_grid.append(current_row)
-                            current_row = []
+        # Game Over screen, only for a board the player completed themselves
+        if self.solved_by_player and self.live_board.is_complete():
+            is_winner = self.live_board.is_solved()
+            SavedGame.delete(self.save_path)
 
-                    is_winner = is_valid_sudoku(game_grid)
+            game_over_screen = EndGameScreen(self.screen_width,
+                                             self.screen_height,
+                                             is_winner)
 
-                    pygame.quit()
-                    game_over_screen = EndGameScreen(self.screen_width,
-                                                     self.screen_height,
-                                                     is_winner)
-
-                    game_over_screen.run()
+            scene_manager.switch(game_over_screen)
 
+    def draw(self):
+        # The background and the buttons never change, so they are only drawn on a full redraw
+        if self.full_redraw:
             self.screen.fill(self.background_color)
+            self.bottom_buttons.draw(self.screen)
+            for cell in self.cells:
+                cell.dirty = 1
 
-            #  updates the cell group
-            self.cell_group.update()
-            self.cell_group.draw(self.screen)
+        #  re-renders changed cells and blits only those
+        self.cell_group.update()
+        dirty_rects = self.cell_group.draw(self.screen)
 
-            # updates the grid
+        # the box lines overlap the cells, so they go back on top of anything redrawn
+        if dirty_rects:
             self.draw_grid()
 
-            # updates the bottom GUI
-            self.bottom_buttons.update(event_list)
-            self.bottom_buttons.draw(self.screen)
-
-            pygame.display.flip()
+        if self.full_redraw:
+            self.full_redraw = False
+            # The group's first draw repaints everything without clearing the dirty flags, which
+            # would blit every cell again next frame; the whole window is being updated anyway
+            for cell in self.cells:
+                cell.dirty = 0
+            return [self.screen.get_rect()]
+        return dirty_rects
+
+    def cell_changed(self, row, col, cell):
+        # Only numbers the player has committed with Enter count as entries
+        value = int(cell.text) if cell.filled_in and cell.text else 0
+        self.live_board.set_value(row, col, value)
+
+        # Only the edited cell and the cells sharing a unit with it can change conflict state
+        index = row * self.cell_number + col
+        for other in (index,) + self.peers[index]:
+            other_row, other_col = divmod(other, self.cell_number)
+            self.cells[other].set_conflict(self.live_board.is_conflicting(other_row, other_col))
+
+    def get_solution(self):
+        # Puzzles from the generators come with their solution; only other boards are solved here
+        if self.solution is None:
+            self.solution = solve(self.initial_game_grid)
+        return self.solution
+
+    # True for the puzzle's given numbers, which the actions below never touch
+    def is_given(self, index):
+        row, col = divmod(index, self.cell_number)
+        return self.initial_game_grid[row][col] not in (0, None)
+
+    def solution_text(self, index):
+        row, col = divmod(index, self.cell_number)
+        return str(self.get_solution()[row][col])
+
+    def show_hint(self):
+        candidates = range(len(self.cells))
+        active = self.input_router.active_index
+        if active is not None:
+            # Prefer the highlighted cell, then scan on from it
+            candidates = [active] + [index for index in candidates if index != active]
+
+        for index in candidates:
+            cell = self.cells[index]
+            if not self.is_given(index) and not (cell.filled_in and cell.text == self.solution_text(index)):
+                cell.set_value(self.solution_text(index), True)
+                if self.live_board.is_complete():
+                    self.solved_by_player = False
+                return
+
+    def check_entries(self):
+        for index, cell in enumerate(self.cells):
+            if self.is_given(index) or not cell.text:
+                continue
+            if cell.text != self.solution_text(index):
+                cell.set_value(cell.text, False)
+                cell.set_mistake(True)
+
+    def solve_board(self):
+        self.solved_by_player = False
+        for index, cell in enumerate(self.cells):
+            if not self.is_given(index):
+                cell.set_value(self.solution_text(index), True)
+
+    def elapsed_time(self):
+        return time.monotonic() - self.start_time
+
+    def restore(self, saved_game):
+        self.solved_by_player = not saved_game.assisted
+        for index, cell in enumerate(self.cells):
+            if self.is_given(index):
+                continue
+            if saved_game.entries.cells[index]:
+                cell.set_value(str(saved_game.entries.cells[index]), True)
+            elif saved_game.pencil.cells[index]:
+                cell.set_value(str(saved_game.pencil.cells[index]), False)
+
+    def save_game(self):
+        size = self.cell_number
+        entries, pencil = Board(size), Board(size)
+        for index, cell in enumerate(self.cells):
+            if cell.text and not self.is_given(index):
+                (entries if cell.filled_in else pencil).cells[index] = int(cell.text)
+
+        solution = self.solution
+        if solution is not None and not isinstance(solution, Board):
+            solution = Board.from_rows(solution)
+        puzzle = self.initial_game_grid
+        if not isinstance(puzzle, Board):
+            puzzle = Board.from_rows(puzzle)
+        SavedGame(puzzle, solution, entries, pencil, self.elapsed_time(),
+                  assisted=not self.solved_by_player).save(self.save_path)
+
+    def quit_game(self):
+        self.save_game()
+        scene_manager.quit()
 
     def move_highlight(self, key):
-        # Deactivate all other cells
-        for cell in self.cell_group:
-            cell.set_active(False)
-
         if key == pygame.K_UP and self.current_row > 0:
             self.current_row -= 1
-        elif key == pygame.K_DOWN and self.current_row < 8:
+        elif key == pygame.K_DOWN and self.current_row < self.cell_number - 1:
             self.current_row += 1
         elif key == pygame.K_LEFT and self.current_col > 0:
             self.current_col -= 1
-        elif key == pygame.K_RIGHT and self.current_col < 8:
+        elif key == pygame.K_RIGHT and self.current_col < self.cell_number - 1:
             self.current_col += 1
 
-        cells = list(self.cell_group)
-        # Activate the new cell, by finding the index of the cell
-        cells[self.current_row * self.cell_number + self.current_col].set_active(True)
+        # Moves the highlight; only the previously active cell is deactivated
+        self.input_router.activate(self.current_row * self.cell_number + self.current_col)
 
     def draw_grid(self):
         amount_of_lines = int(math.sqrt(self.cell_number))  # will generate sqrt of amount of cells - 1
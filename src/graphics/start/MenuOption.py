@@ -1,4 +1,5 @@
 import pygame
+from ..ResourceCache import resources
 
 
 class MenuOption(pygame.sprite.Sprite):
@@ -25,7 +26,7 @@ class MenuOption(pygame.sprite.Sprite):
         self.screen = screen
         self.parameters = parameters
 
-        self.image = self.font.render(self.text, True, self.color)
+        self.image = resources.text(self.font, self.text, self.color)
         self.rect = self.image.get_rect(center=(pos_x, pos_y))
 
     def handle_event(self, event):
@@ -1,10 +1,30 @@
-import sys
 import pygame
 from .TextBox import TextBox
 from .MenuOption import MenuOption
-from ...logic.sudoku_generator import generate_sudoku
+from ..SceneManager import scene_manager
+from ..ResourceCache import resources
+from ...logic.derive import PuzzleDeriver
+from ...logic.puzzle_pool import PuzzlePool
+from ...logic.puzzle_library import PuzzleLibrary
+from ...logic.saved_game import SavedGame
 from ..board.GameBoard import GameBoard
 
+# Puzzles for the menu's difficulties, generated in the background while the menu is shown; after
+# a few searched puzzles per difficulty, the rest are derived from them almost instantly
+puzzle_pool = PuzzlePool(9, ("Easy", "Medium", "Hard"), generate=PuzzleDeriver())
+
+
+def open_library():
+    # A missing or unreadable library just means every puzzle comes from the pool
+    try:
+        return PuzzleLibrary.open_if_exists()
+    except (OSError, ValueError):
+        return None
+
+
+# Pre-generated puzzles written by `generate.py --library`, preferred over the pool when present
+puzzle_library = open_library()
+
 
 class StartMenu:
     """
@@ -23,26 +43,30 @@ class StartMenu:
     Methods:
     - create_menu_option(): Creates and adds a new menu option
     - apply_screen_size(): Handles the resizing of the screen
-    - run(): The main loop
+    - run(): Shows this menu through the shared scene manager
+    - handle_event(): Dispatches one event to the menu options and text boxes
+    - draw(): Redraws the menu
     - start_easy()/medium()/hard(): methods for different menu actions
+    - resume_game(): method to continue the saved game, offered only when there is one
     - quit_game(): method to handle game quitting action
     """
 
     def __init__(self, default_screen_width, default_screen_height):
         self.screen_width = default_screen_width
         self.screen_height = default_screen_height
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = scene_manager.get_screen(self.screen_width, self.screen_height)
+        if not all(puzzle_library is not None and puzzle_library.count(difficulty)
+                   for difficulty in puzzle_pool.pools):
+            puzzle_pool.start()
 
-        pygame.font.init()
         FONT_SIZE_PROPORTION = 0.1  # % of the average screen dimension
         MIN_FONT_SIZE = 1
 
         average_screen_dimension = (self.screen_width + self.screen_height) // 2
         font_size = max(int(average_screen_dimension * FONT_SIZE_PROPORTION), MIN_FONT_SIZE)
 
-        self.font = pygame.font.Font(None, font_size)  # Regular font
-        self.bold_font = pygame.font.Font(None, font_size)  # Bold font
-        self.bold_font.set_bold(True)
+        self.font = resources.font(font_size)  # Regular font
+        self.bold_font = resources.font(font_size, bold=True)  # Bold font
         self.menu_options = pygame.sprite.Group()
 
         START_MENU_OPTIONS_POS_Y = self.screen_height // 8
@@ -50,7 +74,8 @@ class StartMenu:
         # Game menu items
 
         # {"menu_label": menu_function}
-        start_menu_options = {
+        start_menu_options = {"Resume": resume_game} if SavedGame.load() is not None else {}
+        start_menu_options |= {
             "Easy": start_easy,
             "Medium": start_medium,
             "Hard": start_hard
@@ -127,59 +152,69 @@ class StartMenu:
             self.error_message = str(e)
             return
 
-        pygame.quit()
         new_menu = StartMenu(new_width, new_height)
-        new_menu.run()
+        scene_manager.switch(new_menu)
 
     def run(self):
-        while True:
-            event_list = pygame.event.get()
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                # Handle events for each menu option and text box
-                for option in self.menu_options:
-                    option.handle_event(event)
-
-            self.screen.fill((255, 255, 255))
-            if self.error_message:
-                error_surf = self.font.render(self.error_message, True, (255, 0, 0))
-                self.screen.blit(error_surf, (10, 10))  # Display the error message at the top
-
-            self.menu_options.update(event_list)
-            self.menu_options.draw(self.screen)
-            pygame.display.flip()
+        scene_manager.run(self)
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            scene_manager.quit()
+            return
+
+        # Handle events for each menu option and text box
+        for option in self.menu_options:
+            option.handle_event(event)
+
+    def draw(self):
+        self.screen.fill((255, 255, 255))
+        if self.error_message:
+            error_surf = resources.text(self.font, self.error_message, (255, 0, 0))
+            self.screen.blit(error_surf, (10, 10))  # Display the error message at the top
+
+        self.menu_options.update()
+        self.menu_options.draw(self.screen)
 
     @staticmethod
     def quit_game():
-        pygame.quit()
-        sys.exit()
+        scene_manager.quit()
 
 
-def start_easy(screen_width, screen_height):
-    pygame.quit()
+# O(1) pick from the library if it has the difficulty, otherwise from the pool
+def next_puzzle(difficulty):
+    if puzzle_library is not None and puzzle_library.count(difficulty):
+        return puzzle_library.random_puzzle(difficulty)
+    return puzzle_pool.get(difficulty)
 
-    game_grid = generate_sudoku(9, 30)
 
-    board = GameBoard(screen_width, screen_height, game_grid)
-    board.run()
+def resume_game(screen_width, screen_height):
+    saved_game = SavedGame.load()
+    if saved_game is None:
+        return
 
+    board = GameBoard(screen_width, screen_height, saved_game.puzzle,
+                      solution=saved_game.solution, elapsed=saved_game.elapsed)
+    board.restore(saved_game)
+    scene_manager.switch(board)
 
-def start_medium(screen_width, screen_height):
-    pygame.quit()
 
-    game_grid = generate_sudoku(9, 40)
+def start_easy(screen_width, screen_height):
+    game_grid, solution = next_puzzle("Easy")
 
-    board = GameBoard(screen_width, screen_height, game_grid)
-    board.run()
+    board = GameBoard(screen_width, screen_height, game_grid, solution=solution)
+    scene_manager.switch(board)
 
 
-def start_hard(screen_width, screen_height):
-    pygame.quit()
+def start_medium(screen_width, screen_height):
+    game_grid, solution = next_puzzle("Medium")
+
+    board = GameBoard(screen_width, screen_height, game_grid, solution=solution)
+    scene_manager.switch(board)
 
-    game_grid = generate_sudoku(9, 50)
 
-    board = GameBoard(screen_width, screen_height, game_grid)
-    board.run()
+def start_hard(screen_width, screen_height):
+    game_grid, solution = next_puzzle("Hard")
+
+    board = GameBoard(screen_width, screen_height, game_grid, solution=solution)
+    scene_manager.switch(board)
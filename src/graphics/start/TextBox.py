@@ -1,4 +1,5 @@
 import pygame
+from ..ResourceCache import resources
 
 
 class TextBox(pygame.sprite.Sprite):
@@ -49,7 +50,7 @@ class TextBox(pygame.sprite.Sprite):
 
         pygame.draw.rect(self.image, self.outline_color, self.image.get_rect(), self.outline_width)
 
-        text_surface = self.font.render(self.prompt_text + self.text, True, (0, 0, 0))
+        text_surface = resources.text(self.font, self.prompt_text + self.text, (0, 0, 0))
         self.image.blit(text_surface, (5, (self.rect.height - text_surface.get_height()) // 2))
 
         if not self.active:
@@ -1,5 +1,7 @@
 import math
 
+from .board import Board
+
 
 def is_valid_sudoku(board):
     """
@@ -24,8 +26,8 @@ def is_valid_sudoku(board):
     size = len(board)
     box_length = int(math.sqrt(size))
 
-    # Check for 0s
-    if 0 in board: return False
+    # Check for 0s and numbers outside 1..size, which are_valid_sudokus rejects as well
+    if any(not 1 <= num <= size for row in board for num in row): return False
 
     # Check each row
     for row in board:
@@ -43,4 +45,39 @@ def is_valid_sudoku(board):
             if not is_valid_box(board, box_row, box_col, box_length):
                 return False
 
-    return True
\ No newline at end of file
+    return True
+
+
+def are_valid_sudokus(boards):
+    """
+    Checks many complete boards at once; a vectorized is_valid_sudoku for an (N, n, n) array or a
+    sequence of Board objects
+
+    A board passes when every row, column and box, once sorted, equals 1..n, so blanks (0) and
+    out-of-range numbers fail as well as repeats. Needs numpy.
+
+    Returns: numpy bool array of length N
+    """
+    import numpy as np  # Only batch validation needs numpy; the game itself does not
+
+    if len(boards) == 0:
+        return np.zeros(0, dtype=bool)
+    if isinstance(boards[0], Board):
+        # Stack the raw cell bytes directly instead of converting every row
+        size = boards[0].size
+        boards = np.frombuffer(b"".join(board.cells.tobytes() for board in boards), dtype=np.uint8)
+        boards = boards.reshape(-1, size, size)
+    boards = np.asarray(boards)
+    count, size = boards.shape[0], boards.shape[1]
+    box_length = int(math.sqrt(size))
+    expected = np.arange(1, size + 1)
+
+    rows_ok = (np.sort(boards, axis=2) == expected).all(axis=(1, 2))
+    cols_ok = (np.sort(boards, axis=1) == expected[:, None]).all(axis=(1, 2))
+
+    # Regroup so each box becomes one row: (N, box row, row in box, box col, col in box)
+    boxes = boards.reshape(count, box_length, box_length, box_length, box_length)
+    boxes = boxes.transpose(0, 1, 3, 2, 4).reshape(count, size, size)
+    boxes_ok = (np.sort(boxes, axis=2) == expected).all(axis=(1, 2))
+
+    return rows_ok & cols_ok & boxes_ok
@@ -0,0 +1,55 @@
+"""
+Headless Sudoku core: generation, solving, grading, validation and storage; never imports pygame
+
+The public names below are loaded on first use, so `import src.logic` itself costs almost
+nothing and a batch worker only pays for the modules it actually touches.
+"""
+# Public name -> module that defines it
+_EXPORTS = {
+    "Board": "board",
+    "SudokuGenerator": "sudoku_generator",
+    "generate_sudoku": "sudoku_generator",
+    "print_board": "sudoku_generator",
+    "DancingLinks": "sudoku_solver",
+    "solve": "sudoku_solver",
+    "count_solutions": "sudoku_solver",
+    "TECHNIQUES": "logic_solver",
+    "LogicSolver": "logic_solver",
+    "logic_solve": "logic_solver",
+    "DIFFICULTIES": "difficulty",
+    "GRADED_SIZES": "difficulty",
+    "grade_puzzle": "difficulty",
+    "generate_graded_sudoku": "difficulty",
+    "is_valid_sudoku": "ValidSudoku",
+    "are_valid_sudokus": "ValidSudoku",
+    "board_to_line": "puzzle_format",
+    "line_to_board": "puzzle_format",
+    "LiveBoard": "live_board",
+    "PuzzlePool": "puzzle_pool",
+    "PuzzleLibrary": "puzzle_library",
+    "write_library": "puzzle_library",
+    "pack_record": "puzzle_library",
+    "SavedGame": "saved_game",
+    "canonical_form": "canonical",
+    "DedupIndex": "dedup_index",
+    "puzzle_digest": "dedup_index",
+    "PuzzleDeriver": "derive",
+    "random_symmetry": "derive",
+    "apply_symmetry": "derive",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__ is a builtin, so the package itself does not pull in importlib
+    value = getattr(__import__(f"{__name__}.{module}", fromlist=[name]), name)
+    globals()[name] = value  # later lookups skip this function
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
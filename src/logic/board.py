@@ -0,0 +1,160 @@
+import math
+from array import array
+from functools import lru_cache
+
+from .puzzle_format import SYMBOLS, BLANK, BLANKS
+
+# Byte <-> character tables for Board.to_line and Board.from_line; unknown characters decode to 255
+_ENCODE = bytes.maketrans(bytes(range(len(SYMBOLS) + 1)), (BLANK + SYMBOLS).encode())
+_DECODE = bytearray([255]) * 256
+for _num, _char in enumerate(SYMBOLS, 1):
+    _DECODE[ord(_char)] = _DECODE[ord(_char.lower())] = _num
+for _char in BLANKS:
+    _DECODE[ord(_char)] = 0
+_DECODE = bytes(_DECODE)
+
+
+# Rows, columns and boxes of a size x size board, plus the peers of every cell (the cells sharing
+# its row, column or box), with cells numbered row * size + col
+@lru_cache(maxsize=None)
+def board_units(size):
+    box_length = int(math.sqrt(size))
+    rows = [tuple(row * size + col for col in range(size)) for row in range(size)]
+    cols = [tuple(row * size + col for row in range(size)) for col in range(size)]
+    boxes = [tuple((box_row + i) * size + box_col + j
+                   for i in range(box_length) for j in range(box_length))
+             for box_row in range(0, size, box_length)
+             for box_col in range(0, size, box_length)]
+
+    cell_units = [[] for _ in range(size * size)]
+    for unit in rows + cols + boxes:
+        for cell in unit:
+            cell_units[cell].append(unit)
+    peers = tuple(tuple(sorted({other for unit in units for other in unit} - {cell}))
+                  for cell, units in enumerate(cell_units))
+    return tuple(rows), tuple(cols), tuple(boxes), peers
+
+
+class Board:
+    """
+    Compact Sudoku board: one byte per cell in a single array, row by row, 0 for blanks
+
+    A 9x9 board is one 81-byte array instead of ten lists and 81 int references, and it pickles
+    as a single bytes object, so large batches are cheap to hold and to send to other processes.
+    board[row] is a writable memoryview of that row (board[start:stop] a list of them), so code
+    written for lists of rows (board[row][col], iterating rows, len(board)) works on a Board
+    without copying it.
+
+    Attributes:
+        size (int): Row length of the board
+        box_length (int): Row length of a box
+        cells (array): The size * size cell values
+
+    Methods:
+        from_rows(rows) / to_rows(): Converts from / to a list of rows
+        from_line(line) / to_line(): Converts from / to the one-character-per-cell format of puzzle_format
+        unpack(data) / pack(): Converts from / to the packed binary format
+        row(index), col(index), box(index): Zero-copy views of a unit
+        copy(): Independent copy of the board
+    """
+
+    __slots__ = ("size", "box_length", "cells")
+
+    def __init__(self, size, cells=None):
+        box_length = int(math.sqrt(size))
+        if box_length * box_length != size:
+            raise ValueError("Board size must be a perfect square (4, 9, 16, 25, ...)")
+        self.size = size
+        self.box_length = box_length
+        self.cells = array("B", bytes(size * size) if cells is None else cells)
+        if len(self.cells) != size * size:
+            raise ValueError(f"A {size}x{size} board needs {size * size} cells, got {len(self.cells)}")
+
+    @classmethod
+    def from_rows(cls, rows):
+        return cls(len(rows), [num or 0 for row in rows for num in row])
+
+    def to_rows(self):
+        return [self.cells[start:start + self.size].tolist() for start in range(0, len(self.cells), self.size)]
+
+    @classmethod
+    def from_line(cls, line):
+        line = line.strip()
+        size = int(round(len(line) ** 0.5))
+        if size * size != len(line):
+            raise ValueError(f"A puzzle line must have a square number of cells, got {len(line)}")
+        cells = line.encode("ascii", "replace").translate(_DECODE)
+        if max(cells, default=0) > size:
+            bad = next(char for char, num in zip(line, cells) if num > size)
+            raise ValueError(f"Invalid cell {bad!r} for a {size}x{size} board")
+        return cls(size, cells)
+
+    def to_line(self):
+        return self.cells.tobytes().translate(_ENCODE).decode("ascii")
+
+    # Packed format: one byte holding the size, then the cells two per byte (high nibble first).
+    # Numbers above 15 do not fit in a nibble, so boards of 16x16 and up store a byte per cell.
+    def pack(self):
+        if self.size > 15:
+            return bytes([self.size]) + self.cells.tobytes()
+        cells = self.cells.tobytes() + b"\0" * (len(self.cells) % 2)
+        return bytes([self.size]) + bytes((cells[i] << 4) | cells[i + 1] for i in range(0, len(cells), 2))
+
+    @classmethod
+    def unpack(cls, data):
+        size = data[0]
+        count = size * size
+        if size > 15:
+            return cls(size, data[1:1 + count])
+        packed = data[1:1 + (count + 1) // 2]
+        cells = bytearray(2 * len(packed))
+        cells[0::2] = bytes(byte >> 4 for byte in packed)
+        cells[1::2] = bytes(byte & 0xF for byte in packed)
+        return cls(size, cells[:count])
+
+    def row(self, index):
+        start = index * self.size
+        return memoryview(self.cells)[start:start + self.size]
+
+    def col(self, index):
+        return memoryview(self.cells)[index::self.size]
+
+    # The box as box_length row segments, each a view into the board
+    def box(self, index):
+        view = memoryview(self.cells)
+        top = (index // self.box_length) * self.box_length
+        left = (index % self.box_length) * self.box_length
+        return [view[row * self.size + left:row * self.size + left + self.box_length]
+                for row in range(top, top + self.box_length)]
+
+    def copy(self):
+        return Board(self.size, self.cells)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(row) for row in range(self.size)[index]]
+        if not isinstance(index, int):
+            raise TypeError(f"Board rows are indexed by int or slice, not {type(index).__name__}")
+        if not -self.size <= index < self.size:
+            raise IndexError("Board row out of range")
+        return self.row(index % self.size)
+
+    def __iter__(self):
+        return (self.row(index) for index in range(self.size))
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.size == other.size and self.cells == other.cells
+        return NotImplemented
+
+    __hash__ = None
+
+    # Pickle as the raw cell bytes, so sending boards to worker processes stays cheap
+    def __reduce__(self):
+        return Board, (self.size, self.cells.tobytes())
+
+    def __repr__(self):
+        return f"Board.from_line({self.to_line()!r})"
@@ -0,0 +1,172 @@
+import math
+from itertools import permutations
+
+from .puzzle_format import SYMBOLS, BLANK
+
+
+def canonical_form(board):
+    """
+    Canonical form of a puzzle under the sudoku symmetries: transposition, reordering bands and
+    stacks, reordering rows within a band and columns within a stack, and relabeling the numbers
+
+    Two puzzles have the same canonical form exactly when one can be turned into the other by those
+    symmetries. The form is the lexicographically smallest puzzle (blank before any number) that
+    they produce, with the numbers labeled 1, 2, ... in order of first appearance, so it is itself
+    a puzzle isomorphic to `board`.
+
+    The search builds that puzzle one row at a time, keeping every way of reaching the smallest
+    prefix. Rather than trying every column order, it only records the order the rows so far pin
+    down: columns that have looked the same in every row stay interchangeable, so it only branches
+    where a number appears for the first time. Assumes no number repeats within a row. A puzzle
+    takes milliseconds at 9x9; rows full of new numbers branch the most, so a complete grid takes
+    seconds at 9x9 and is out of reach at 16x16.
+
+    Returns: The canonical puzzle as a puzzle_format line
+    """
+    size = len(board)
+    box = int(math.sqrt(size))
+    rows = [list(row) for row in board]
+    columns = [list(col) for col in zip(*rows)]
+
+    # A search state: (grid, bands not started, rows left in the current band, column order).
+    # The column order is (stack blocks, column blocks of every stack, label of every number
+    # (0 = none yet), next free label); a block is a tuple of interchangeable stacks or columns
+    order = ((tuple(range(box)),),
+             tuple((tuple(range(stack * box, (stack + 1) * box)),) for stack in range(box)),
+             (0,) * (size + 1),
+             1)
+    states = [(grid, tuple(range(box)), (), order) for grid in (rows, columns)]
+
+    canonical = []
+    for _ in range(size):
+        best = None
+        extended = []
+        for grid, bands, band_rows, order in states:
+            for row, new_bands, new_band_rows in row_choices(bands, band_rows, box):
+                row_labels, orders = label_row(grid[row], order)
+                if best is None or row_labels < best:
+                    best, extended = row_labels, []
+                if row_labels == best:
+                    extended.extend((grid, new_bands, new_band_rows, new_order) for new_order in orders)
+        canonical.extend(best)
+        states = extended
+
+    return "".join(SYMBOLS[label - 1] if label else BLANK for label in canonical)
+
+
+# Rows that may come next: the rest of the current band, or any row of a band not started yet.
+# Yields (row, bands not started, rows left in its band)
+def row_choices(bands, band_rows, box):
+    if band_rows:
+        for row in band_rows:
+            yield row, bands, tuple(other for other in band_rows if other != row)
+        return
+    for band in bands:
+        rest = tuple(other for other in bands if other != band)
+        band_rows = range(band * box, (band + 1) * box)
+        for row in band_rows:
+            yield row, rest, tuple(other for other in band_rows if other != row)
+
+
+def label_row(values, order):
+    """
+    Smallest labeling of one row over the column orders still allowed
+
+    Stacks are placed left to right, each time taking the stack whose part of the row labels
+    smallest. Stacks that are all blank in this row stay interchangeable; a tie between stacks
+    holding new numbers is a branch.
+
+    Returns: (labels of the row, list of the column orders that produce it)
+    """
+    stack_blocks, col_blocks, labels, next_label = order
+    row_labels = []
+    # Branches: (stack blocks placed so far, column blocks, labels, next label)
+    branches = [((), col_blocks, labels, next_label)]
+    for block in stack_blocks:
+        pending = [(block, branch) for branch in branches]
+        branches = []
+        while pending:
+            best = None
+            placed_stacks = 1
+            step = []
+            for remaining, (placed, blocks, current, label) in pending:
+                parts = {stack: label_stack(values, blocks[stack], current, label) for stack in remaining}
+                smallest = min(segment for segment, _ in parts.values())
+                if best is None or smallest < best:
+                    best, step = smallest, []
+                if smallest != best:
+                    continue
+
+                tied = tuple(stack for stack in remaining if parts[stack][0] == smallest)
+                if not any(smallest):
+                    # Blank stacks all come first, and are the same blank stacks in every branch
+                    placed_stacks = len(tied)
+                    rest = tuple(stack for stack in remaining if stack not in tied)
+                    step.append((rest, (placed + (tied,), blocks, current, label)))
+                    continue
+                for stack in tied:
+                    rest = tuple(other for other in remaining if other != stack)
+                    for refined, new_labels, new_next in parts[stack][1]:
+                        new_blocks = blocks[:stack] + (refined,) + blocks[stack + 1:]
+                        step.append((rest, (placed + ((stack,),), new_blocks, new_labels, new_next)))
+
+            row_labels.extend(best * placed_stacks)
+            pending = []
+            for remaining, branch in step:
+                if remaining:
+                    pending.append((remaining, branch))
+                else:
+                    branches.append(branch)
+
+    return row_labels, branches
+
+
+def label_stack(values, blocks, labels, next_label):
+    """
+    Smallest labeling of one stack's part of a row. Within each block of interchangeable columns:
+    blanks first, then labeled numbers by label, then numbers without a label, which take the
+    next labels in every possible order (one branch each)
+
+    Returns: (segment labels, list of (refined column blocks, labels, next label) branches)
+    """
+    segment = []
+    refined = ()
+    new_blocks = []  # (position in refined, columns of each new number) for every block
+    new_numbers = []
+    for block in blocks:
+        known = {}
+        fresh = {}
+        for col in block:
+            num = values[col]
+            if num and not labels[num]:
+                fresh.setdefault(num, []).append(col)
+            else:
+                known.setdefault(labels[num] if num else 0, []).append(col)
+
+        for label in sorted(known):
+            segment.extend([label] * len(known[label]))
+            refined += (tuple(known[label]),)
+        for offset, num in enumerate(fresh):
+            segment.extend([next_label + len(new_numbers) + offset] * len(fresh[num]))
+        if fresh:
+            new_blocks.append((len(refined), [tuple(columns) for columns in fresh.values()], list(fresh)))
+            refined += (None,) * len(fresh)  # filled in per branch below
+            new_numbers.extend(fresh)
+
+    if not new_numbers:
+        return tuple(segment), [(refined, labels, next_label)]
+
+    # Every block's new numbers can be labeled in any order; each combination is a branch
+    branches = [(list(refined), list(labels), next_label)]
+    for position, columns, numbers in new_blocks:
+        expanded = []
+        for blocks_so_far, current, label in branches:
+            for order in permutations(range(len(numbers))):
+                updated_blocks = blocks_so_far[:]
+                updated_labels = current[:]
+                for offset, index in enumerate(order):
+                    updated_blocks[position + offset] = columns[index]
+                    updated_labels[numbers[index]] = label + offset
+                expanded.append((updated_blocks, updated_labels, label + len(numbers)))
+        branches = expanded
+    return tuple(segment), [(tuple(blocks), tuple(current), label) for blocks, current, label in branches]
@@ -0,0 +1,88 @@
+import hashlib
+import os
+
+from .canonical import canonical_form
+
+# File layout: MAGIC, then one DIGEST_SIZE-byte digest per puzzle, in the order they were added
+MAGIC = b"SDKDUP01"
+DIGEST_SIZE = 16
+
+
+def puzzle_digest(board):
+    """
+    Fingerprint of a puzzle that is the same for every puzzle isomorphic to it (see canonical_form)
+
+    Returns: bytes of DIGEST_SIZE
+    """
+    return hashlib.blake2b(canonical_form(board).encode(), digest_size=DIGEST_SIZE).digest()
+
+
+class DedupIndex:
+    """
+    Set of the puzzles seen so far, up to symmetry, kept in memory and appended to a file
+
+    A lookup hashes the puzzle's canonical form and checks a set, so its cost does not grow with
+    the number of puzzles indexed. The file only ever grows by whole digests; a digest cut short by
+    a crash is ignored when the index is opened again.
+
+    Attributes:
+        path (str): Index file, or None for an index that is not persisted
+        digests (set): Digests of every puzzle seen
+        duplicates (int): Puzzles rejected since the index was opened
+
+    Methods:
+        add(board): Adds a puzzle; returns False if an isomorphic one was already indexed
+        add_digest(digest): The same for a digest computed with puzzle_digest, e.g. by a worker
+        close(): Flushes and closes the file
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.digests = set()
+        self.duplicates = 0
+        self.file = None
+        if path is None:
+            return
+
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                data = file.read()
+            if not data.startswith(MAGIC):
+                raise ValueError(f"{path} is not a dedup index")
+            end = len(data) - (len(data) - len(MAGIC)) % DIGEST_SIZE
+            self.digests.update(data[start:start + DIGEST_SIZE] for start in range(len(MAGIC), end, DIGEST_SIZE))
+            self.file = open(path, "r+b")
+            self.file.seek(end)
+            self.file.truncate()
+        else:
+            self.file = open(path, "wb")
+            self.file.write(MAGIC)
+
+    def add(self, board):
+        return self.add_digest(puzzle_digest(board))
+
+    def add_digest(self, digest):
+        if digest in self.digests:
+            self.duplicates += 1
+            return False
+        self.digests.add(digest)
+        if self.file is not None:
+            self.file.write(digest)
+        return True
+
+    def __contains__(self, board):
+        return puzzle_digest(board) in self.digests
+
+    def __len__(self):
+        return len(self.digests)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
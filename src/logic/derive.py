@@ -0,0 +1,81 @@
+import math
+
+from .difficulty import generate_graded_sudoku
+from .sudoku_generator import make_rng
+
+
+def random_symmetry(size, rng):
+    """
+    Picks one of the transformations that turn any valid board into another valid board: a
+    relabeling of the numbers, an order of the bands and of the rows in each band, an order of the
+    stacks and of the columns in each stack, and whether to transpose first
+
+    Returns: (digits, rows, columns, transpose), where digits[num] is the new label of num (digits[0]
+        is 0), and rows/columns list the source row/column of each new row/column
+    """
+    box = int(math.sqrt(size))
+    digits = [0] + rng.sample(range(1, size + 1), size)
+    rows = [band * box + row for band in rng.sample(range(box), box) for row in rng.sample(range(box), box)]
+    columns = [stack * box + col for stack in rng.sample(range(box), box) for col in rng.sample(range(box), box)]
+    return digits, rows, columns, rng.random() < 0.5
+
+
+def apply_symmetry(board, symmetry):
+    """
+    Applies a random_symmetry() transformation to a board in O(n^2)
+
+    A puzzle and its solution transformed the same way stay a puzzle and its solution. The moves
+    only rename and reorder units, so the number of solutions and the techniques needed to solve
+    the puzzle, hence its grade_puzzle band, are unchanged.
+
+    Returns: The transformed board as a list of rows
+    """
+    digits, rows, columns, transpose = symmetry
+    if transpose:
+        board = list(zip(*board))
+    return [[digits[board[row][col]] for col in columns] for row in rows]
+
+
+class PuzzleDeriver:
+    """
+    Puzzle generator that only searches for a few seed puzzles of each kind and derives the rest
+
+    A drop-in generate function: called like the generator it wraps, e.g.
+    deriver(size, difficulty, with_solution=True) for generate_graded_sudoku. The first `seeds`
+    calls with the same arguments generate puzzles as usual and keep them; every later call applies
+    a random symmetry to one of those seeds and its solution instead, which costs O(n^2) rather than
+    a backtracking search. Derived puzzles have exactly their seed's difficulty and number of
+    solutions, but are all isomorphic to one of the seeds (so a DedupIndex rejects them).
+
+    Attributes:
+        seeds (int): Seed puzzles generated per set of arguments
+        generate (function): Generator called as generate(*args, seed=rng, with_solution=True)
+        rng (random.Random): Source of the seeds and the transformations
+        seed_puzzles (dict): List of (puzzle, solution) seeds per arguments tuple
+
+    Methods:
+        derive(puzzle, solution): Returns a random isomorphic copy of a (puzzle, solution) pair
+    """
+
+    def __init__(self, seeds=4, generate=generate_graded_sudoku, seed=None):
+        if seeds < 1:
+            raise ValueError("A deriver needs at least one seed puzzle")
+        self.seeds = seeds
+        self.generate = generate
+        self.rng = make_rng(seed)
+        self.seed_puzzles = {}
+
+    def __call__(self, *args, with_solution=False):
+        seed_puzzles = self.seed_puzzles.setdefault(args, [])
+        if len(seed_puzzles) < self.seeds:
+            puzzle, solution = self.generate(*args, seed=self.rng, with_solution=True)
+            seed_puzzles.append((puzzle, solution))
+            # The caller gets its own copy, as a caller may fill in the board it is given
+            puzzle, solution = [list(row) for row in puzzle], [list(row) for row in solution]
+        else:
+            puzzle, solution = self.derive(*self.rng.choice(seed_puzzles))
+        return (puzzle, solution) if with_solution else puzzle
+
+    def derive(self, puzzle, solution):
+        symmetry = random_symmetry(len(puzzle), self.rng)
+        return apply_symmetry(puzzle, symmetry), apply_symmetry(solution, symmetry)
@@ -0,0 +1,119 @@
+from .logic_solver import LogicSolver, TECHNIQUES, bit_count
+from .sudoku_generator import SudokuGenerator, make_rng
+
+# Difficulty bands, easiest first
+DIFFICULTIES = ("Easy", "Medium", "Hard", "Expert")
+
+# Band of a puzzle given the hardest technique needed to solve it
+TECHNIQUE_DIFFICULTY = {
+    None: "Easy",
+    "naked single": "Easy",
+    "hidden single": "Medium",
+    "naked pair": "Hard",
+    "pointing": "Hard",
+    "box-line reduction": "Hard",
+    "naked triple": "Hard",
+    "search": "Expert",
+}
+
+# Points for every step made with a technique; search counts once, on top of the steps before it
+TECHNIQUE_WEIGHTS = {
+    "naked single": 1,
+    "hidden single": 2,
+    "naked pair": 5,
+    "pointing": 6,
+    "box-line reduction": 7,
+    "naked triple": 8,
+    "search": 50,
+}
+
+# Share of the board removed before the first grading, per target band. The carve is then
+# adjusted one cell at a time until the grade matches
+STARTING_REMOVED_RATIO = {
+    "Easy": 30 / 81,
+    "Medium": 45 / 81,
+    "Hard": 54 / 81,
+    "Expert": 58 / 81,
+}
+
+# Single-cell removals or re-additions tried on one carve before starting from a new board
+MAX_ADJUSTMENTS = 30
+# New boards tried before giving up on a band; a 9x9 band is usually reached within ten
+MAX_REGENERATIONS = 100
+
+# Board sizes whose puzzles spread over all the bands. Every unique 4x4 puzzle grades Easy, and
+# 16x16 puzzles are too slow to carve to the harder bands
+GRADED_SIZES = (9,)
+
+
+def grade_puzzle(board):
+    """
+    Grades a puzzle by the hardest technique and the number of steps LogicSolver needs
+
+    Returns: (difficulty, score); difficulty is one of DIFFICULTIES, or None if the board has no
+    solution. score orders puzzles within a band: the weighted sum of all technique steps
+    """
+    solver = LogicSolver(board)
+    if solver.solve() is None:
+        return None, 0
+
+    score = sum(TECHNIQUE_WEIGHTS[name] * count for name, count in solver.technique_counts.items())
+    if solver.used_search:
+        score += TECHNIQUE_WEIGHTS["search"]
+    return TECHNIQUE_DIFFICULTY[solver.hardest_technique()], score
+
+
+def generate_graded_sudoku(size, difficulty, seed=None, with_solution=False):
+    """
+    Generates a uniquely solvable puzzle whose grade_puzzle band is `difficulty`
+
+    A puzzle that grades too easy has one more cell removed (keeping uniqueness); one that grades
+    too hard gets back the cell the target band's techniques were least able to pin down. Only when
+    neither adjustment reaches the band is a new board generated. `seed` (an int/str seed or a
+    random.Random) makes the result reproducible.
+
+    Returns: The puzzle as a list of rows, 0 for blanks; with with_solution=True, a
+        (puzzle, solution) tuple
+
+    Raises: ValueError if size is not in GRADED_SIZES, or no board reached the band within
+        MAX_REGENERATIONS tries
+    """
+    if size not in GRADED_SIZES:
+        raise ValueError(f"Graded puzzles are only generated for sizes {GRADED_SIZES}, not {size}")
+    rng = make_rng(seed)
+    target = DIFFICULTIES.index(difficulty)
+    allowed = tuple(name for name in TECHNIQUES if DIFFICULTIES.index(TECHNIQUE_DIFFICULTY[name]) <= target)
+
+    for _ in range(MAX_REGENERATIONS):
+        sudoku = SudokuGenerator(size, round(STARTING_REMOVED_RATIO[difficulty] * size * size), rng)
+        sudoku.fill_values()
+        solution = sudoku.get_solution()
+        sudoku.remove_cells(unique=True)
+
+        for _ in range(MAX_ADJUSTMENTS):
+            band, _ = grade_puzzle(sudoku.get_board())
+            level = DIFFICULTIES.index(band)
+            if level == target:
+                if with_solution:
+                    return sudoku.get_board(), solution
+                return sudoku.get_board()
+
+            if level < target:
+                # Too easy: carve one more cell, if any can go without losing uniqueness
+                sudoku.removed_cells = 1
+                if not sudoku.remove_cells(unique=True):
+                    break
+            else:
+                # Too hard: give back the cell with the most candidates left where the
+                # allowed techniques get stuck
+                stuck = LogicSolver(sudoku.get_board(), allowed, use_search=False)
+                stuck.solve()
+                grid = stuck.grid
+                widest = max(bit_count(grid.candidates[cell]) for cell in range(size * size)
+                             if not grid.values[cell])
+                cell = rng.choice([cell for cell in range(size * size)
+                                      if not grid.values[cell] and bit_count(grid.candidates[cell]) == widest])
+                row, col = divmod(cell, size)
+                sudoku.place(row, col, solution[row][col])
+
+    raise ValueError(f"No {size}x{size} board reached {difficulty} in {MAX_REGENERATIONS} tries")
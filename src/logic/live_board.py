@@ -0,0 +1,78 @@
+import math
+
+
+class LiveBoard:
+    """
+    Board being played, with occupancy counts per row, column and box kept up to date on every edit
+
+    Every query below is O(1); nothing rescans the board.
+
+    Attributes:
+        size (int): Row length of the board
+        box_length (int): Row length of a box
+        values (list): Number in every cell (row * size + col), 0 when empty
+        row_counts, col_counts, box_counts (list): counts[unit][num] is how often num appears in the unit
+        filled (int): Number of non-empty cells
+        duplicates (int): Extra copies of numbers across all units; 0 means no conflicts
+
+    Methods:
+        set_value(row, col, num): Changes a cell (0 clears it) and updates the counts
+        get_value(row, col): Number in a cell
+        is_complete(): True when every cell is filled
+        is_solved(): True when every cell is filled and nothing conflicts
+        is_conflicting(row, col): True when the cell's number repeats in its row, column or box
+    """
+
+    def __init__(self, board):
+        self.size = len(board)
+        self.box_length = int(math.sqrt(self.size))
+        self.values = [0] * (self.size * self.size)
+        self.row_counts = [[0] * (self.size + 1) for _ in range(self.size)]
+        self.col_counts = [[0] * (self.size + 1) for _ in range(self.size)]
+        self.box_counts = [[0] * (self.size + 1) for _ in range(self.size)]
+        self.filled = 0
+        self.duplicates = 0
+
+        for row_index, row in enumerate(board):
+            for col_index, num in enumerate(row):
+                if num:
+                    self.set_value(row_index, col_index, num)
+
+    def box_index(self, row, col):
+        return (row // self.box_length) * self.box_length + col // self.box_length
+
+    def set_value(self, row, col, num):
+        cell = row * self.size + col
+        old = self.values[cell]
+        if old == num:
+            return
+
+        counts = (self.row_counts[row], self.col_counts[col], self.box_counts[self.box_index(row, col)])
+        if old:
+            self.filled -= 1
+            for unit in counts:
+                unit[old] -= 1
+                if unit[old] >= 1:
+                    self.duplicates -= 1
+        if num:
+            self.filled += 1
+            for unit in counts:
+                if unit[num] >= 1:
+                    self.duplicates += 1
+                unit[num] += 1
+        self.values[cell] = num
+
+    def get_value(self, row, col):
+        return self.values[row * self.size + col]
+
+    def is_complete(self):
+        return self.filled == self.size * self.size
+
+    def is_solved(self):
+        return self.is_complete() and self.duplicates == 0
+
+    def is_conflicting(self, row, col):
+        num = self.values[row * self.size + col]
+        return bool(num) and (self.row_counts[row][num] > 1 or
+                              self.col_counts[col][num] > 1 or
+                              self.box_counts[self.box_index(row, col)][num] > 1)
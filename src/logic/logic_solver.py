@@ -0,0 +1,259 @@
+import math
+from itertools import combinations
+
+from .board import board_units
+from .sudoku_solver import solve
+
+# Techniques in the order they are tried, easiest first
+TECHNIQUES = (
+    "naked single",
+    "hidden single",
+    "naked pair",
+    "pointing",
+    "box-line reduction",
+    "naked triple",
+)
+
+
+def bit_count(mask):
+    return bin(mask).count("1")
+
+
+class CandidateGrid:
+    """
+    Values and remaining candidates of every cell of a sudoku board, kept up to date incrementally
+
+    Attributes:
+        size (int): Row length of the board
+        box_length (int): Row length of a box
+        values (list): Number in every cell (row * size + col), 0 when empty
+        candidates (list): Bitmask of the numbers still possible in every empty cell (bit n for number n)
+        rows, cols, boxes (tuple): Cells of every unit
+        peers (tuple): Cells sharing a unit with every cell
+        contradiction (bool): True once a placement or elimination left the board unsolvable
+
+    Methods:
+        place(cell, num): Fills a cell and removes num from the candidates of its peers
+        eliminate(cell, mask): Removes numbers from a cell's candidates; returns True if any were removed
+        is_solved(): True when every cell has a value
+        to_board(): The current values as a list of rows
+    """
+
+    def __init__(self, board):
+        self.size = len(board)
+        self.box_length = int(math.sqrt(self.size))
+        self.rows, self.cols, self.boxes, self.peers = board_units(self.size)
+        self.values = [0] * (self.size * self.size)
+        self.candidates = [(1 << (self.size + 1)) - 2] * (self.size * self.size)
+        self.contradiction = False
+
+        for row_index, row in enumerate(board):
+            for col_index, num in enumerate(row):
+                if num:
+                    cell = row_index * self.size + col_index
+                    if not self.candidates[cell] & (1 << num):
+                        self.contradiction = True
+                    self.place(cell, num)
+
+    def place(self, cell, num):
+        bit = 1 << num
+        self.values[cell] = num
+        self.candidates[cell] = 0
+        for peer in self.peers[cell]:
+            if self.candidates[peer] & bit:
+                self.eliminate(peer, bit)
+
+    def eliminate(self, cell, mask):
+        if not self.candidates[cell] & mask:
+            return False
+        self.candidates[cell] &= ~mask
+        if not self.candidates[cell] and not self.values[cell]:
+            self.contradiction = True
+        return True
+
+    def is_solved(self):
+        return all(self.values)
+
+    def to_board(self):
+        return [self.values[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+
+
+class LogicSolver:
+    """
+    Solves a sudoku board with human-style techniques, falling back to search only when stuck
+
+    Every pass tries the techniques in TECHNIQUES order and starts over from the easiest one as soon
+    as any of them makes progress, so the recorded techniques are the easiest ones that suffice.
+    `techniques` restricts the solver to a subset, and with use_search=False it stops when stuck,
+    leaving the partial result in grid.
+
+    Attributes:
+        grid (CandidateGrid): Candidate grid being solved
+        techniques (tuple): Names of the techniques the solver may use
+        use_search (bool): Whether to finish with the search solver when the techniques get stuck
+        technique_counts (dict): Times each technique made progress, by name
+        steps (int): Total number of successful technique applications
+        used_search (bool): True if the techniques got stuck and the search solver finished the board
+        solution (list): Solved board, or None if unsolved or unsolvable
+
+    Methods:
+        solve(): Runs the solver and returns the solution (None if there is none)
+        hardest_technique(): Name of the hardest technique needed, or "search" if search was used
+    """
+
+    def __init__(self, board, techniques=TECHNIQUES, use_search=True):
+        self.grid = CandidateGrid(board)
+        self.techniques = tuple(name for name in TECHNIQUES if name in techniques)
+        self.use_search = use_search
+        self.technique_counts = {name: 0 for name in TECHNIQUES}
+        self.steps = 0
+        self.used_search = False
+        self.solution = None
+
+        technique_methods = {
+            "naked single": self.naked_singles,
+            "hidden single": self.hidden_singles,
+            "naked pair": lambda: self.naked_subsets(2),
+            "pointing": self.pointing,
+            "box-line reduction": self.box_line_reduction,
+            "naked triple": lambda: self.naked_subsets(3),
+        }
+        self.technique_methods = [(name, technique_methods[name]) for name in self.techniques]
+
+    def solve(self):
+        grid = self.grid
+        while not grid.contradiction and not grid.is_solved():
+            for name, technique in self.technique_methods:
+                if technique():
+                    self.technique_counts[name] += 1
+                    self.steps += 1
+                    break
+            else:
+                break
+
+        if grid.contradiction:
+            return None
+        if grid.is_solved():
+            self.solution = grid.to_board()
+        elif self.use_search:
+            self.used_search = True
+            self.solution = solve(grid.to_board())
+        return self.solution
+
+    def hardest_technique(self):
+        if self.used_search:
+            return "search"
+        used = [name for name in TECHNIQUES if self.technique_counts[name]]
+        return used[-1] if used else None
+
+    # Fill every cell that has a single candidate left
+    def naked_singles(self):
+        grid = self.grid
+        progress = False
+        for cell, mask in enumerate(grid.candidates):
+            if mask and not mask & (mask - 1):
+                grid.place(cell, mask.bit_length() - 1)
+                progress = True
+        return progress
+
+    # Fill every number that has a single possible cell left in some unit
+    def hidden_singles(self):
+        grid = self.grid
+        progress = False
+        for unit in grid.rows + grid.cols + grid.boxes:
+            seen_once = 0
+            seen_twice = 0
+            for cell in unit:
+                mask = grid.candidates[cell]
+                seen_twice |= seen_once & mask
+                seen_once |= mask
+            singles = seen_once & ~seen_twice
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for cell in unit:
+                    if grid.candidates[cell] & bit:
+                        grid.place(cell, bit.bit_length() - 1)
+                        progress = True
+                        break
+                else:
+                    # An earlier placement in this unit took the only cell left for this number
+                    grid.contradiction = True
+        return progress
+
+    # When `count` cells of a unit share exactly `count` candidates between them, those numbers
+    # can be removed from every other cell of the unit
+    def naked_subsets(self, count):
+        grid = self.grid
+        progress = False
+        for unit in grid.rows + grid.cols + grid.boxes:
+            open_cells = [cell for cell in unit if 2 <= bit_count(grid.candidates[cell]) <= count]
+            if len(open_cells) < count:
+                continue
+            for subset in combinations(open_cells, count):
+                union = 0
+                for cell in subset:
+                    union |= grid.candidates[cell]
+                if bit_count(union) != count:
+                    continue
+                for cell in unit:
+                    if cell not in subset and grid.eliminate(cell, union):
+                        progress = True
+        return progress
+
+    # When a number's cells in a box all lie on one row or column, it can be removed from the
+    # rest of that row or column
+    def pointing(self):
+        grid = self.grid
+        progress = False
+        for box in grid.boxes:
+            for num in range(1, grid.size + 1):
+                bit = 1 << num
+                cells = [cell for cell in box if grid.candidates[cell] & bit]
+                if len(cells) < 2:
+                    continue
+                rows = {cell // grid.size for cell in cells}
+                cols = {cell % grid.size for cell in cells}
+                if len(rows) == 1:
+                    line = grid.rows[rows.pop()]
+                elif len(cols) == 1:
+                    line = grid.cols[cols.pop()]
+                else:
+                    continue
+                for cell in line:
+                    if cell not in box and grid.eliminate(cell, bit):
+                        progress = True
+        return progress
+
+    # When a number's cells in a row or column all lie in one box, it can be removed from the
+    # rest of that box
+    def box_line_reduction(self):
+        grid = self.grid
+        progress = False
+        for line in grid.rows + grid.cols:
+            for num in range(1, grid.size + 1):
+                bit = 1 << num
+                cells = [cell for cell in line if grid.candidates[cell] & bit]
+                if len(cells) < 2:
+                    continue
+                boxes = {(cell // grid.size // grid.box_length, cell % grid.size // grid.box_length)
+                         for cell in cells}
+                if len(boxes) != 1:
+                    continue
+                box_row, box_col = boxes.pop()
+                box = grid.boxes[box_row * grid.box_length + box_col]
+                for cell in box:
+                    if cell not in line and grid.eliminate(cell, bit):
+                        progress = True
+        return progress
+
+
+def logic_solve(board):
+    """
+    Solves a sudoku board with LogicSolver
+
+    Returns: The LogicSolver after solving; read its solution, technique_counts, steps and used_search
+    """
+    solver = LogicSolver(board)
+    solver.solve()
+    return solver
@@ -0,0 +1,37 @@
+# Symbols for the numbers 1..25, so every supported board size has one character per cell
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+# Characters accepted as an empty cell when reading; BLANK is the one written
+BLANK = "."
+BLANKS = ".0"
+
+
+def board_to_line(board):
+    """
+    Encodes a board as one character per cell, row by row (an 81-char string for 9x9)
+
+    Returns: str
+    """
+    return "".join(SYMBOLS[num - 1] if num else BLANK for row in board for num in row)
+
+
+def line_to_board(line):
+    """
+    Decodes a string written by board_to_line; '0' is also accepted for blanks
+
+    Returns: The board as a list of rows
+    """
+    line = line.strip()
+    size = int(round(len(line) ** 0.5))
+    if size * size != len(line):
+        raise ValueError(f"A puzzle line must have a square number of cells, got {len(line)}")
+
+    cells = []
+    for char in line:
+        if char in BLANKS:
+            cells.append(0)
+        else:
+            num = SYMBOLS.find(char.upper()) + 1
+            if not 0 < num <= size:
+                raise ValueError(f"Invalid cell {char!r} for a {size}x{size} board")
+            cells.append(num)
+    return [cells[row * size:(row + 1) * size] for row in range(size)]
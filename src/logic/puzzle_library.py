@@ -0,0 +1,141 @@
+import mmap
+import os
+import struct
+
+from .board import Board
+from .sudoku_generator import make_rng
+
+# File layout: header, one entry per section, then the records of every section back to back.
+# A record is a packed puzzle followed by its packed solution (see Board.pack), all records the same size.
+MAGIC = b"SDKLIB01"
+HEADER = struct.Struct("<8sBHH")  # magic, board size, record size, number of sections
+SECTION = struct.Struct("<16sQQ")  # difficulty name, offset of its first record, number of records
+
+# Library the game looks for in the working directory (written by `generate.py --library`)
+DEFAULT_LIBRARY_PATH = "puzzles.sudokulib"
+
+
+def record_size(size):
+    return 2 * len(Board(size).pack())
+
+
+def pack_record(puzzle, solution):
+    """
+    Encodes a puzzle and its solution as one library record; both may be lists of rows or Boards
+
+    Returns: bytes of record_size(size)
+    """
+    if not isinstance(puzzle, Board):
+        puzzle = Board.from_rows(puzzle)
+    if not isinstance(solution, Board):
+        solution = Board.from_rows(solution)
+    return puzzle.pack() + solution.pack()
+
+
+def write_library(path, size, sections):
+    """
+    Writes a puzzle library
+
+    Records are streamed straight to the file, so a section can be a generator producing millions
+    of them. The header is filled in once every section's count is known.
+
+    Parameters:
+        path (str): File to write
+        size (int): Row length of every board in the library
+        sections (list): (difficulty, iterable of pack_record() records) pairs
+
+    Returns: dict of records written per difficulty
+    """
+    sections = list(sections)
+    expected = record_size(size)
+    entries = []
+    with open(path, "wb") as file:
+        file.seek(HEADER.size + SECTION.size * len(sections))
+        for difficulty, records in sections:
+            offset = file.tell()
+            count = 0
+            for record in records:
+                if len(record) != expected:
+                    raise ValueError(f"Record of {len(record)} bytes in a library of {expected}-byte records")
+                file.write(record)
+                count += 1
+            entries.append((difficulty, offset, count))
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, size, expected, len(entries)))
+        for difficulty, offset, count in entries:
+            file.write(SECTION.pack(difficulty.encode(), offset, count))
+    return {difficulty: count for difficulty, _, count in entries}
+
+
+class PuzzleLibrary:
+    """
+    Read-only, memory-mapped puzzle library written by write_library
+
+    The file is never read as a whole: a lookup computes the record's offset and decodes just those
+    bytes, so picking a puzzle is O(1) however many the library holds, and the OS pages in only
+    what is used.
+
+    Attributes:
+        path (str): Library file
+        size (int): Row length of the boards
+        record_size (int): Bytes per record
+        sections (dict): (offset of first record, record count) per difficulty
+
+    Methods:
+        count(difficulty): Number of puzzles of that difficulty
+        get(difficulty, index): Returns the (puzzle, solution) Boards of one record
+        random_puzzle(difficulty, rng): Returns a random (puzzle, solution) of that difficulty; rng is a
+            seed or random.Random, as for the generators
+        close(): Unmaps the file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self.data) < HEADER.size:
+                raise ValueError(f"{path} is not a puzzle library")
+            magic, self.size, self.record_size, count = HEADER.unpack_from(self.data)
+            if magic != MAGIC or self.record_size != record_size(self.size):
+                raise ValueError(f"{path} is not a puzzle library")
+
+            self.sections = {}
+            for index in range(count):
+                name, offset, records = SECTION.unpack_from(self.data, HEADER.size + index * SECTION.size)
+                if offset + records * self.record_size > len(self.data):
+                    raise ValueError(f"{path} is truncated")
+                self.sections[name.rstrip(b"\0").decode()] = (offset, records)
+        except (ValueError, struct.error):
+            self.data.close()
+            raise
+
+    @classmethod
+    def open_if_exists(cls, path=DEFAULT_LIBRARY_PATH):
+        return cls(path) if os.path.exists(path) else None
+
+    def count(self, difficulty):
+        return self.sections.get(difficulty, (0, 0))[1]
+
+    def get(self, difficulty, index):
+        offset, count = self.sections[difficulty]
+        if not 0 <= index < count:
+            raise IndexError(f"{difficulty} has {count} puzzles, no puzzle {index}")
+        start = offset + index * self.record_size
+        half = self.record_size // 2
+        return (Board.unpack(self.data[start:start + half]),
+                Board.unpack(self.data[start + half:start + self.record_size]))
+
+    def random_puzzle(self, difficulty, rng=None):
+        return self.get(difficulty, make_rng(rng).randrange(self.count(difficulty)))
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,110 @@
+import threading
+from collections import deque
+
+from .difficulty import DIFFICULTIES, generate_graded_sudoku
+
+
+class PuzzlePool:
+    """
+    Ready-made puzzles per difficulty, each stored with its solution, topped up by a background thread
+
+    Once a difficulty drops below low_watermark puzzles, the worker refills it up to high_watermark.
+    get() never waits on the worker: it pops a ready puzzle in O(1), or generates one on the spot
+    when that difficulty has run dry. If generate raises in the worker, the worker stops refilling
+    that difficulty (until get() drains it again) and the next get() re-raises the error.
+
+    Attributes:
+        size (int): Row length of the generated boards
+        low_watermark (int): Pool size that triggers a refill
+        high_watermark (int): Pool size a refill stops at
+        generate (function): Called as generate(size, difficulty, with_solution=True) to make a
+            (puzzle, solution) pair
+        pools (dict): deque of ready (puzzle, solution) pairs for each difficulty
+        refilling (set): Difficulties the worker is currently topping up
+        condition (threading.Condition): Guards pools/refilling and wakes the worker
+        worker (threading.Thread): The refill thread, or None if not started
+        stopped (bool): Set by stop() to make the refill thread exit
+        error (Exception): Error raised by generate in the refill thread, not yet reported by get()
+
+    Methods:
+        start(): Starts the refill thread (once) and fills every pool to the high watermark
+        stop(): Asks the refill thread to exit after its current puzzle
+        get(difficulty): Returns a (puzzle, solution) pair of that difficulty
+        counts(): Number of ready puzzles per difficulty
+    """
+
+    def __init__(self, size=9, difficulties=DIFFICULTIES, low_watermark=2, high_watermark=5,
+                 generate=generate_graded_sudoku):
+        if not 0 <= low_watermark <= high_watermark:
+            raise ValueError("Watermarks must satisfy 0 <= low_watermark <= high_watermark")
+
+        self.size = size
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.generate = generate
+        self.pools = {difficulty: deque() for difficulty in difficulties}
+        self.refilling = set()
+        self.condition = threading.Condition()
+        self.worker = None
+        self.stopped = False
+        self.error = None
+
+    def start(self):
+        with self.condition:
+            self.stopped = False
+            self.refilling.update(difficulty for difficulty, pool in self.pools.items()
+                                  if len(pool) < self.high_watermark)
+            self.condition.notify_all()
+            if self.worker is not None and self.worker.is_alive():
+                return
+            self.worker = threading.Thread(target=self.refill, name="PuzzlePoolRefill", daemon=True)
+            self.worker.start()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def get(self, difficulty):
+        with self.condition:
+            error, self.error = self.error, None
+            if error is not None:
+                raise error
+            pool = self.pools[difficulty]
+            puzzle = pool.popleft() if pool else None
+            if len(pool) < self.low_watermark and difficulty not in self.refilling:
+                self.refilling.add(difficulty)
+                self.condition.notify_all()
+
+        if puzzle is None:
+            puzzle = self.generate(self.size, difficulty, with_solution=True)
+        return puzzle
+
+    def counts(self):
+        with self.condition:
+            return {difficulty: len(pool) for difficulty, pool in self.pools.items()}
+
+    # Worker loop: generate for the emptiest difficulty being refilled until all reach the high watermark
+    def refill(self):
+        while True:
+            with self.condition:
+                while not self.stopped and not self.refilling:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                difficulty = min(self.refilling, key=lambda name: len(self.pools[name]))
+
+            try:
+                puzzle = self.generate(self.size, difficulty, with_solution=True)
+            except Exception as error:
+                # Keep serving the other difficulties; get() reports the error
+                with self.condition:
+                    self.error = error
+                    self.refilling.discard(difficulty)
+                continue
+
+            with self.condition:
+                pool = self.pools[difficulty]
+                pool.append(puzzle)
+                if len(pool) >= self.high_watermark:
+                    self.refilling.discard(difficulty)
@@ -0,0 +1,76 @@
+import json
+import os
+
+from .board import Board
+
+# Where the game keeps the session to resume
+DEFAULT_SAVE_PATH = os.path.join(os.path.expanduser("~"), ".sudoku_save.json")
+
+
+class SavedGame:
+    """
+    Snapshot of a game in progress, stored as JSON with every board as one puzzle_format line
+
+    Attributes:
+        puzzle (Board): The puzzle's given numbers
+        solution (Board): Its solution, or None if not known
+        entries (Board): Numbers the player committed, 0 elsewhere
+        pencil (Board): Numbers the player sketched but did not commit, 0 elsewhere
+        elapsed (float): Seconds played so far
+        assisted (bool): Solve or a Hint completed the board, so finishing it is not a win
+
+    Methods:
+        save(path): Writes the snapshot, replacing any earlier one in one step
+        load(path): Reads a snapshot; returns None when there is none or it cannot be read
+        delete(path): Removes the snapshot, if any
+    """
+
+    VERSION = 2
+
+    def __init__(self, puzzle, solution, entries, pencil, elapsed, assisted=False):
+        self.puzzle = puzzle
+        self.solution = solution
+        self.entries = entries
+        self.pencil = pencil
+        self.elapsed = elapsed
+        self.assisted = assisted
+
+    def save(self, path=DEFAULT_SAVE_PATH):
+        state = {
+            "version": self.VERSION,
+            "puzzle": self.puzzle.to_line(),
+            "solution": self.solution.to_line() if self.solution is not None else None,
+            "entries": self.entries.to_line(),
+            "pencil": self.pencil.to_line(),
+            "elapsed": self.elapsed,
+            "assisted": self.assisted,
+        }
+        # Write next to the target first, so a crash mid-write cannot corrupt the previous save
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(state, file)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_SAVE_PATH):
+        try:
+            with open(path) as file:
+                state = json.load(file)
+            if state.get("version") != cls.VERSION:
+                return None
+            solution = state["solution"]
+            return cls(Board.from_line(state["puzzle"]),
+                       Board.from_line(solution) if solution else None,
+                       Board.from_line(state["entries"]),
+                       Board.from_line(state["pencil"]),
+                       float(state["elapsed"]),
+                       bool(state["assisted"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def delete(path=DEFAULT_SAVE_PATH):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,103 +1,383 @@
 import random
 import math
 
+from .board import Board, board_units
+
 
 class SudokuGenerator:
+    # Boards at least this large are filled from a permuted pattern instead of by search;
+    # backtracking on them has heavy-tailed run times
+    PATTERN_FILL_MIN_SIZE = 25
+    # Search nodes allowed per cell before a fill attempt is abandoned and restarted
+    FILL_NODES_PER_CELL = 4
+
     # Constructor
-    def __init__(self, row_length, removed_cells):
+    def __init__(self, row_length, removed_cells, seed=None):
+        # Private random source; the same seed gives the same board on every platform, and
+        # generators in parallel threads never share state
+        self.rng = make_rng(seed)
         # Initialize a row_length x row_length board with zeros
         self.board = [[0] * row_length for _ in range(row_length)]
         self.removed_cells = removed_cells  # Number of cells to remove for puzzle
         self.row_length = row_length  # Size of the board
         self.box_length = int(math.sqrt(row_length))  # Size of boxes - sqrt of row_length
+        if self.box_length * self.box_length != row_length:
+            raise ValueError("Board size must be a perfect square (4, 9, 16, 25, ...)")
+
+        # Bit `num` of a mask is set when num is already used in that row, column or box,
+        # so a candidate test is a single AND instead of a scan over the board
+        self.row_masks = [0] * row_length
+        self.col_masks = [0] * row_length
+        self.box_masks = [0] * row_length
+        self.full_mask = (1 << (row_length + 1)) - 2  # bits 1..row_length
+
+        self.solution = None  # Copy of the full board made by fill_values, kept after cells are removed
+
+        self.nodes = 0  # Numbers placed by the last fill_remaining call
+        self.backtracks = 0  # Numbers the last fill_remaining call had to take back
+        self.node_budget = None  # Limit on nodes for the current fill_remaining call, if any
 
     # Return the current board state
     def get_board(self):
         return self.board
 
+    # Return the completed board from fill_values (None before it has run)
+    def get_solution(self):
+        return self.solution
+
+    # Index of the box containing (row, col), counted left to right, top to bottom
+    def box_index(self, row, col):
+        return (row // self.box_length) * self.box_length + col // self.box_length
+
+    # Write num at (row, col) and mark it as used in the row, column and box masks
+    def place(self, row, col, num):
+        bit = 1 << num
+        self.board[row][col] = num
+        self.row_masks[row] |= bit
+        self.col_masks[col] |= bit
+        self.box_masks[self.box_index(row, col)] |= bit
+
+    # Clear (row, col) and release its number from the row, column and box masks
+    def unplace(self, row, col):
+        bit = ~(1 << self.board[row][col])
+        self.board[row][col] = 0
+        self.row_masks[row] &= bit
+        self.col_masks[col] &= bit
+        self.box_masks[self.box_index(row, col)] &= bit
+
+    # Bitmask of the numbers that can still be placed at (row, col)
+    def candidate_mask(self, row, col):
+        used = self.row_masks[row] | self.col_masks[col] | self.box_masks[self.box_index(row, col)]
+        return ~used & self.full_mask
+
+    # List the numbers that can still be placed at (row, col), in increasing order
+    def candidates(self, row, col):
+        free = self.candidate_mask(row, col)
+        nums = []
+        while free:
+            bit = free & -free
+            nums.append(bit.bit_length() - 1)
+            free ^= bit
+        return nums
+
     # Check if a number can be placed in the given row
     def valid_in_row(self, row, num):
-        return num not in self.board[row]
+        return not self.row_masks[row] & (1 << num)
 
     # Check if a number can be placed in the given column
     def valid_in_col(self, col, num):
-        return all(self.board[row][col] != num for row in range(self.row_length))
+        return not self.col_masks[col] & (1 << num)
 
-    # Check if a number can be placed in the 3x3 box
+    # Check if a number can be placed in the box starting at (row_start, col_start)
     def valid_in_box(self, row_start, col_start, num):
-        for i in range(3):
-            for j in range(3):
-                if self.board[row_start + i][col_start + j] == num:
-                    return False
-        return True
+        return not self.box_masks[self.box_index(row_start, col_start)] & (1 << num)
 
     # Check if placing num at (row, col) is valid
     def is_valid(self, row, col, num):
-        return (self.valid_in_row(row, num) and
-                self.valid_in_col(col, num) and
-                self.valid_in_box(row - row % 3, col - col % 3, num))
+        return bool(self.candidate_mask(row, col) & (1 << num))
 
-    # Fill a 3x3 box with numbers 1-9
+    # Fill a box_length x box_length box with numbers 1-row_length
     def fill_box(self, row, col):
         nums = list(range(1, self.row_length + 1))
-        random.shuffle(nums)
-        for i in range(3):
-            for j in range(3):
-                self.board[row + i][col + j] = nums.pop()
+        self.rng.shuffle(nums)
+        for i in range(self.box_length):
+            for j in range(self.box_length):
+                self.place(row + i, col + j, nums.pop())
 
-    # Fill the diagonal 3x3 boxes to start puzzle generation
+    # Fill the diagonal boxes to start puzzle generation; they never share a row, column or box
     def fill_diagonal(self):
-        for i in range(0, self.row_length, 3):
+        for i in range(0, self.row_length, self.box_length):
             self.fill_box(i, i)
 
-    # Remove a number of cells as specified by removed_cells
-    def remove_cells(self):
+    # Remove a number of cells as specified by removed_cells. With unique=True only removals
+    # that keep exactly one solution are kept; returns the number of cells actually removed
+    def remove_cells(self, unique=False):
+        if unique:
+            return self.remove_cells_unique()
+
         for _ in range(self.removed_cells):
-            row = random.randint(0, self.row_length - 1)
-            col = random.randint(0, self.row_length - 1)
+            row = self.rng.randint(0, self.row_length - 1)
+            col = self.rng.randint(0, self.row_length - 1)
             # Ensure the cell isn't already empty before removing
             while self.board[row][col] == 0:
-                row = random.randint(0, self.row_length - 1)
-                col = random.randint(0, self.row_length - 1)
-            self.board[row][col] = 0  # Set the cell's value to 0
-
-    def fill_remaining(self, row, col):
-        if col >= self.row_length and row < self.row_length - 1:
-            row += 1
-            col = 0
-        if row >= self.row_length and col >= self.row_length:
-            return True
-        if row < self.box_length:
-            if col < self.box_length:
-                col = self.box_length
-        elif row < self.row_length - self.box_length:
-            if col == int(row // self.box_length * self.box_length):
-                col += self.box_length
-        else:
-            if col == self.row_length - self.box_length:
-                row += 1
-                col = 0
-                if row >= self.row_length:
-                    return True
-
-        for num in range(1, self.row_length + 1):
-            if self.is_valid(row, col, num):
-                self.board[row][col] = num
-                if self.fill_remaining(row, col + 1):
-                    return True
-                self.board[row][col] = 0
-        return False
+                row = self.rng.randint(0, self.row_length - 1)
+                col = self.rng.randint(0, self.row_length - 1)
+            self.unplace(row, col)  # Set the cell's value to 0
+        return self.removed_cells
+
+    # Try cells in random order and blank each one only if the puzzle stays uniquely solvable.
+    # Stops after removed_cells removals, or earlier when no further cell can be removed
+    def remove_cells_unique(self):
+        cells = [(row, col) for row in range(self.row_length) for col in range(self.row_length)
+                 if self.board[row][col] != 0]
+        self.rng.shuffle(cells)
+
+        removed = 0
+        for row, col in cells:
+            if removed >= self.removed_cells:
+                break
+            num = self.board[row][col]
+            self.unplace(row, col)
+            if self.count_solutions(2) == 1:
+                removed += 1
+            else:
+                self.place(row, col, num)
+        return removed
+
+    # Count the solutions of the current board, stopping as soon as `limit` have been found.
+    # The board and masks are left untouched
+    def count_solutions(self, limit=2):
+        size = self.row_length
+        candidates = [0] * (size * size)
+        empty = []
+        for row in range(size):
+            for col in range(size):
+                if self.board[row][col] == 0:
+                    cell = row * size + col
+                    candidates[cell] = self.candidate_mask(row, col)
+                    empty.append(cell)
+        return count_completions(candidates, empty, board_units(size), limit)
+
+    # Fill every empty cell by backtracking. Each step branches on the empty cell with the
+    # fewest candidates (minimum remaining values) and tries them in random order, which
+    # keeps the search shallow enough for 16x16 boards. With a node_budget, the attempt
+    # gives up (returns False, board unchanged) once that many numbers have been placed.
+    #
+    # The search runs on an explicit stack rather than by recursion, so Python's recursion
+    # limit never applies (a 25x25 board would need 625 nested calls) and each step costs a
+    # loop iteration instead of a call. All of its state is allocated up front:
+    #   order[:total - depth] are the empty cells; choosing one swaps it with the last of them,
+    #       so order[total - 1 - d] is the cell filled at depth d
+    #   options[d] holds the numbers still to try there, picked[d] where the cell was taken from
+    def fill_remaining(self, node_budget=None):
+        order = [(row, col) for row in range(self.row_length)
+                 for col in range(self.row_length) if self.board[row][col] == 0]
+        total = len(order)
+        options = [None] * total
+        picked = [0] * total
+        self.nodes = 0
+        self.backtracks = 0
+        self.node_budget = node_budget
+
+        depth = 0
+        while depth < total:
+            if node_budget is not None and self.nodes >= node_budget:
+                for row, col in order[total - depth:]:
+                    self.unplace(row, col)
+                return False
+
+            remaining = total - depth
+            best_index = 0
+            best_mask = 0
+            best_count = self.row_length + 1
+            for index in range(remaining):
+                row, col = order[index]
+                mask = self.candidate_mask(row, col)
+                count = bin(mask).count("1")
+                if count < best_count:
+                    best_index, best_mask, best_count = index, mask, count
+                    if count <= 1:
+                        break
+
+            if best_count:
+                last = remaining - 1
+                order[best_index], order[last] = order[last], order[best_index]
+                picked[depth] = best_index
+
+                nums = []
+                while best_mask:
+                    bit = best_mask & -best_mask
+                    nums.append(bit.bit_length() - 1)
+                    best_mask ^= bit
+                self.rng.shuffle(nums)
+                nums.reverse()  # tried by popping from the end
+                options[depth] = nums
+            else:
+                # Dead end: undo filled cells until one still has numbers left to try
+                while True:
+                    if depth == 0:
+                        return False
+                    depth -= 1
+                    last = total - 1 - depth
+                    row, col = order[last]
+                    self.unplace(row, col)
+                    self.backtracks += 1
+                    if options[depth]:
+                        break
+                    # Out of numbers: the cell becomes empty again, back where it was taken from
+                    index = picked[depth]
+                    order[index], order[last] = order[last], order[index]
+
+            row, col = order[total - 1 - depth]
+            self.place(row, col, options[depth].pop())
+            self.nodes += 1
+            depth += 1
+        return True
+
+    # Reset the board and masks to an empty grid
+    def clear(self):
+        self.board = [[0] * self.row_length for _ in range(self.row_length)]
+        self.row_masks = [0] * self.row_length
+        self.col_masks = [0] * self.row_length
+        self.box_masks = [0] * self.row_length
+
+    # Fill the whole board from the base pattern (box_length * (row % box_length) + row // box_length + col)
+    # after shuffling the digits, the bands, the rows inside each band, the stacks and the columns
+    # inside each stack. Each of those permutations preserves validity, so this runs in O(n^2)
+    def fill_pattern(self):
+        size, box = self.row_length, self.box_length
+
+        def shuffled_lines():
+            groups = list(range(box))
+            self.rng.shuffle(groups)
+            lines = []
+            for group in groups:
+                inner = list(range(box))
+                self.rng.shuffle(inner)
+                lines.extend(group * box + i for i in inner)
+            return lines
+
+        rows = shuffled_lines()
+        cols = shuffled_lines()
+        nums = list(range(1, size + 1))
+        self.rng.shuffle(nums)
+        for row in range(size):
+            base_row = rows[row]
+            for col in range(size):
+                base_col = cols[col]
+                self.place(row, col, nums[(box * (base_row % box) + base_row // box + base_col) % size])
 
     def fill_values(self):
+        if self.row_length >= self.PATTERN_FILL_MIN_SIZE:
+            self.fill_pattern()
+            self.solution = [row[:] for row in self.board]
+            return
+
+        # Restart from a fresh diagonal when an attempt runs over budget; this cuts off the
+        # long searches and also covers diagonals that cannot be completed at all (e.g. on 4x4)
+        node_budget = self.FILL_NODES_PER_CELL * self.row_length * self.row_length
         self.fill_diagonal()
-        self.fill_remaining(0, self.box_length)
+        while not self.fill_remaining(node_budget):
+            self.clear()
+            self.fill_diagonal()
+        self.solution = [row[:] for row in self.board]
+
+
+def count_completions(candidates, empty, units, limit):
+    """
+    Counts the ways to fill the `empty` cells, stopping once `limit` solutions are found
+
+    candidates[cell] is the bitmask of numbers still possible in that cell, and units is
+    board_units(size). Cells with a single candidate are placed straight away and eliminated from
+    their peers, and so are numbers with a single place left in a row, column or box; only then
+    does the search branch on the cell with the fewest candidates. Without the hidden singles,
+    carving a unique 16x16 puzzle past about half the board takes minutes. Both lists are modified
+    in place.
+
+    Returns: int (at most limit)
+    """
+    peers = units[3]
+    while empty:
+        best_pos = 0
+        best_count = len(peers)
+        for pos, cell in enumerate(empty):
+            count = bin(candidates[cell]).count("1")
+            if count < best_count:
+                best_pos, best_count = pos, count
+                if count <= 1:
+                    break
+        if best_count == 0:
+            return 0
+        if best_count > 1 and place_hidden_singles(candidates, empty, units):
+            continue
+
+        cell = empty[best_pos]
+        empty[best_pos] = empty[-1]
+        empty.pop()
+        mask = candidates[cell]
+
+        if best_count == 1:
+            for peer in peers[cell]:
+                candidates[peer] &= ~mask
+            continue
+
+        total = 0
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            branch = candidates[:]
+            branch[cell] = bit
+            for peer in peers[cell]:
+                branch[peer] &= ~bit
+            total += count_completions(branch, empty[:], units, limit - total)
+            if total >= limit:
+                break
+        return total
+    return 1
+
+
+# Narrows every empty cell that is the only place left for a number in one of its units to that
+# number, leaving it for count_completions to place; a cell narrowed to two different numbers
+# ends up with no candidates. Returns whether any cell changed
+def place_hidden_singles(candidates, empty, units):
+    open_cells = set(empty)
+    changed = False
+    for unit_group in units[:3]:
+        for unit in unit_group:
+            once = twice = 0
+            for cell in unit:
+                if cell in open_cells:
+                    twice |= once & candidates[cell]
+                    once |= candidates[cell]
+            hidden = once & ~twice
+            if not hidden:
+                continue
+            for cell in unit:
+                if cell in open_cells and candidates[cell] & hidden and candidates[cell] & ~hidden:
+                    candidates[cell] &= hidden
+                    changed = True
+    return changed
+
+
+# Returns `seed` itself when it already is a random.Random, else a new Random seeded with it
+# (int, str, bytes, or None for a fresh random seed)
+def make_rng(seed=None):
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
 
-def generate_sudoku(size, removed):
-    sudoku = SudokuGenerator(size, removed)
+# With with_solution=True, returns (puzzle, solution) instead of just the puzzle;
+# with compact=True, boards are returned as Board objects instead of lists of rows
+def generate_sudoku(size, removed, unique=False, seed=None, with_solution=False, compact=False):
+    sudoku = SudokuGenerator(size, removed, seed)
     sudoku.fill_values()
-    board = sudoku.get_board()
-    sudoku.remove_cells()
-    board = sudoku.get_board()
+    sudoku.remove_cells(unique)
+    board, solution = sudoku.get_board(), sudoku.get_solution()
+    if compact:
+        board, solution = Board.from_rows(board), Board.from_rows(solution)
+    if with_solution:
+        return board, solution
     return board
 
 
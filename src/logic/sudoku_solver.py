@@ -0,0 +1,241 @@
+import math
+from functools import lru_cache
+
+
+class DancingLinks:
+    """
+    Exact cover search (Knuth's Algorithm X) over a dancing links matrix for one sudoku board
+
+    A size x size board has 4 * size^2 constraint columns (each cell filled once, and each number
+    once per row, column and box) and size^3 candidate rows (number n at cell (r, c)), each row
+    covering exactly four columns. The board's givens are selected up front; search() then finds
+    the remaining rows.
+
+    Attributes:
+        size (int): Row length of the board
+        left, right, up, down (list): Circular links of every node; node 0 is the root header
+            and nodes 1..4 * size^2 are the column headers
+        column (list): Column header of every node
+        count (list): Number of nodes left in each column
+        candidate (list): Candidate row (cell * size + number - 1) of every node
+        solution (list): Candidate rows chosen on the current search path
+        solutions (list): Completed boards found so far, up to the requested limit
+        nodes (int): Candidate rows tried during the search
+        consistent (bool): False when the givens already conflict with each other
+
+    Methods:
+        cover(col) / uncover(col): Remove or restore a column and every row that intersects it
+        search(limit): Runs the search until `limit` solutions are found; returns the count
+    """
+
+    def __init__(self, board):
+        self.size = len(board)
+        left, right, up, down, column, count, candidate, row_start = exact_cover_matrix(self.size)
+        self.left = list(left)
+        self.right = list(right)
+        self.up = list(up)
+        self.down = list(down)
+        self.column = column
+        self.count = list(count)
+        self.candidate = candidate
+        self.solution = []
+        self.solutions = []
+        self.nodes = 0
+        self.consistent = True
+
+        # Select the givens; a given whose columns are already covered contradicts another given
+        covered = set()
+        for row_index, row in enumerate(board):
+            for col_index, num in enumerate(row):
+                if not num:
+                    continue
+                first = row_start[(row_index * self.size + col_index) * self.size + num - 1]
+                node = first
+                while True:
+                    if column[node] in covered:
+                        self.consistent = False
+                        return
+                    covered.add(column[node])
+                    self.cover(column[node])
+                    node = self.right[node]
+                    if node == first:
+                        break
+                self.solution.append(candidate[first])
+
+    def cover(self, col):
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+        left[right[col]] = left[col]
+        right[left[col]] = right[col]
+        row = down[col]
+        while row != col:
+            node = right[row]
+            while node != row:
+                up[down[node]] = up[node]
+                down[up[node]] = down[node]
+                count[column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def uncover(self, col):
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+        row = up[col]
+        while row != col:
+            node = left[row]
+            while node != row:
+                count[column[node]] += 1
+                up[down[node]] = node
+                down[up[node]] = node
+                node = left[node]
+            row = up[row]
+        left[right[col]] = col
+        right[left[col]] = col
+
+    def search(self, limit):
+        if not self.consistent:
+            return 0
+        self.search_columns(limit)
+        return len(self.solutions)
+
+    # Recursive step of search; returns True once `limit` solutions have been recorded.
+    # cover/uncover are inlined in the loop below to save a method call per column
+    def search_columns(self, limit):
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+        if right[0] == 0:
+            self.solutions.append(self.solution_board())
+            return len(self.solutions) >= limit
+
+        # Branch on the column with the fewest rows left
+        col = right[0]
+        best = count[col]
+        current = right[col]
+        while current != 0 and best > 1:
+            if count[current] < best:
+                col, best = current, count[current]
+            current = right[current]
+        if best == 0:
+            return False
+
+        self.cover(col)
+        row = down[col]
+        while row != col:
+            self.nodes += 1
+            self.solution.append(self.candidate[row])
+
+            # Cover the other columns of this row
+            node = right[row]
+            while node != row:
+                header = column[node]
+                left[right[header]] = left[header]
+                right[left[header]] = right[header]
+                other = down[header]
+                while other != header:
+                    link = right[other]
+                    while link != other:
+                        up[down[link]] = up[link]
+                        down[up[link]] = down[link]
+                        count[column[link]] -= 1
+                        link = right[link]
+                    other = down[other]
+                node = right[node]
+
+            if self.search_columns(limit):
+                # Stopping here; the matrix is discarded so there is nothing to restore
+                return True
+
+            # Uncover them again in reverse order
+            node = left[row]
+            while node != row:
+                header = column[node]
+                other = up[header]
+                while other != header:
+                    link = left[other]
+                    while link != other:
+                        count[column[link]] += 1
+                        up[down[link]] = link
+                        down[up[link]] = link
+                        link = left[link]
+                    other = up[other]
+                left[right[header]] = header
+                right[left[header]] = header
+                node = left[node]
+
+            self.solution.pop()
+            row = down[row]
+        self.uncover(col)
+        return False
+
+    def solution_board(self):
+        board = [[0] * self.size for _ in range(self.size)]
+        for chosen in self.solution:
+            cell, num = divmod(chosen, self.size)
+            board[cell // self.size][cell % self.size] = num + 1
+        return board
+
+
+# Builds the dancing links matrix of an empty size x size board. Solvers copy the mutable lists,
+# so the matrix is built only once per size
+@lru_cache(maxsize=None)
+def exact_cover_matrix(size):
+    box_length = int(math.sqrt(size))
+    area = size * size
+    columns = 4 * area
+
+    # Root (0) and column headers (1..columns) form the horizontal header ring
+    left = [col - 1 for col in range(columns + 1)]
+    left[0] = columns
+    right = [col + 1 for col in range(columns + 1)]
+    right[columns] = 0
+    up = list(range(columns + 1))
+    down = list(range(columns + 1))
+    column = list(range(columns + 1))
+    count = [0] * (columns + 1)
+    candidate = [-1] * (columns + 1)
+    row_start = []
+
+    for row in range(size):
+        for col in range(size):
+            cell = row * size + col
+            box = (row // box_length) * box_length + col // box_length
+            for num in range(size):
+                constraints = (1 + cell,
+                               1 + area + row * size + num,
+                               1 + 2 * area + col * size + num,
+                               1 + 3 * area + box * size + num)
+                first = len(column)
+                for offset, header in enumerate(constraints):
+                    node = first + offset
+                    left.append(node - 1 if offset else first + 3)
+                    right.append(node + 1 if offset < 3 else first)
+                    # Append to the bottom of the column
+                    up.append(up[header])
+                    down.append(header)
+                    down[up[header]] = node
+                    up[header] = node
+                    column.append(header)
+                    candidate.append(cell * size + num)
+                    count[header] += 1
+                row_start.append(first)
+
+    return tuple(left), tuple(right), tuple(up), tuple(down), tuple(column), tuple(count), \
+        tuple(candidate), tuple(row_start)
+
+
+def solve(board):
+    """
+    Solves a sudoku board (rows of ints, 0 for blanks) with dancing links
+
+    Returns: The solved board as a new list of rows, or None if there is no solution
+    """
+    links = DancingLinks(board)
+    if links.search(1):
+        return links.solutions[0]
+    return None
+
+
+def count_solutions(board, limit=2):
+    """
+    Counts the solutions of a sudoku board, stopping as soon as `limit` have been found
+
+    Returns: int (at most limit)
+    """
+    return DancingLinks(board).search(limit)